@@ -0,0 +1,137 @@
+"""
+Benchmark: near-duplicate detection
+
+Builds a synthetic corpus where each story is reported by several sources
+with light rewording, then times NearDuplicateDetector.collapse and scores
+the detected groups against the known ground truth. A brute-force pairwise
+Jaccard pass over a sample checks how many true pairs LSH banding misses.
+The same stories are then grouped again with titles only, as for feeds
+without summaries, where most MinHash bins are empty.
+
+    python benchmarks/bench_dedup.py --stories 10000 --copies 3
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from dedup import NearDuplicateDetector
+
+VOCABULARY = [f"w{i}" for i in range(5000)]
+PRIORITIES = ['high', 'medium', 'low']
+
+
+def reword(words, rng, edits):
+    """Copy words with a few substitutions and deletions"""
+    words = list(words)
+    for _ in range(edits):
+        position = rng.randrange(len(words))
+        if rng.random() < 0.5:
+            words[position] = rng.choice(VOCABULARY)
+        else:
+            del words[position]
+    return words
+
+
+def make_corpus(stories, copies, seed, summary_length=50):
+    """Return (articles, story_id per article)"""
+    rng = random.Random(seed)
+    articles = []
+    story_ids = []
+    for story in range(stories):
+        title = [rng.choice(VOCABULARY) for _ in range(10)]
+        summary = [rng.choice(VOCABULARY) for _ in range(summary_length)]
+        for copy in range(rng.randint(1, copies)):
+            edits = 0 if copy == 0 else 2
+            articles.append({
+                'title': ' '.join(reword(title, rng, edits)),
+                'summary': ' '.join(reword(summary, rng, edits * 2)) + '.' if summary else '',
+                'link': f"https://example.com/{story}/{copy}",
+                'source': f"Source {copy}",
+                'priority': PRIORITIES[rng.randrange(3)],
+                'relevance_score': rng.randint(0, 12)
+            })
+            story_ids.append(story)
+    order = list(range(len(articles)))
+    rng.shuffle(order)
+    return [articles[i] for i in order], [story_ids[i] for i in order]
+
+
+def true_pairs(story_ids, indices):
+    by_story = {}
+    for i in indices:
+        by_story.setdefault(story_ids[i], []).append(i)
+    return {(a, b) for members in by_story.values()
+            for n, a in enumerate(members) for b in members[n + 1:]}
+
+
+def found_pairs(groups, indices=None):
+    keep = set(indices) if indices is not None else None
+    pairs = set()
+    for members in groups:
+        members = sorted(m for m in members if keep is None or m in keep)
+        pairs.update((a, b) for n, a in enumerate(members) for b in members[n + 1:])
+    return pairs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--stories', type=int, default=10000)
+    parser.add_argument('--copies', type=int, default=3, help='max sources per story')
+    parser.add_argument('--threshold', type=float, default=0.5)
+    parser.add_argument('--brute-force-sample', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    articles, story_ids = make_corpus(args.stories, args.copies, args.seed)
+    detector = NearDuplicateDetector(threshold=args.threshold)
+    print(f"Corpus: {len(articles)} articles from {args.stories} stories")
+
+    start = time.perf_counter()
+    groups = detector.find_groups(articles)
+    elapsed = time.perf_counter() - start
+    print(f"LSH grouping:   {elapsed:8.3f}s  ({len(articles) / elapsed:,.0f} articles/s)")
+
+    start = time.perf_counter()
+    unique = detector.collapse([dict(a) for a in articles])
+    print(f"Collapse:       {time.perf_counter() - start:8.3f}s  -> {len(unique)} stories")
+
+    expected = true_pairs(story_ids, range(len(articles)))
+    found = found_pairs(groups)
+    hits = len(found & expected)
+    print(f"Precision:      {hits / max(len(found), 1):8.3f}")
+    print(f"Recall:         {hits / max(len(expected), 1):8.3f}")
+
+    titles, title_ids = make_corpus(args.stories, args.copies, args.seed, summary_length=0)
+    start = time.perf_counter()
+    title_groups = detector.find_groups(titles)
+    elapsed = time.perf_counter() - start
+    print(f"Title-only:     {elapsed:8.3f}s  ({len(titles) / elapsed:,.0f} articles/s)")
+    expected = true_pairs(title_ids, range(len(titles)))
+    found = found_pairs(title_groups)
+    hits = len(found & expected)
+    print(f"  Precision:    {hits / max(len(found), 1):8.3f}")
+    print(f"  Recall:       {hits / max(len(expected), 1):8.3f}")
+
+    sample = list(range(min(args.brute_force_sample, len(articles))))
+    shingles = [detector.shingles(articles[i]) for i in sample]
+    start = time.perf_counter()
+    brute = set()
+    for n, a in enumerate(sample):
+        for b in sample[n + 1:]:
+            x, y = shingles[a], shingles[b]
+            if x and y and len(x & y) >= args.threshold * len(x | y):
+                brute.add((a, b))
+    elapsed = time.perf_counter() - start
+    lsh_sample = found_pairs(groups, sample)
+    print(f"Brute force on {len(sample)} articles: {elapsed:.3f}s, "
+          f"LSH found {len(lsh_sample & brute)}/{len(brute)} of its pairs")
+
+
+if __name__ == "__main__":
+    main()
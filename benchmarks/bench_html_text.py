@@ -0,0 +1,82 @@
+"""
+Benchmark: summary HTML-to-text cleaning
+
+Builds summaries shaped like real feed entries (paragraphs, links, images,
+tracking pixels, entities) and times HTMLTextCleaner on first sight and
+again from its content-hash cache, then compares summary sizes and the
+keyword scan over raw and cleaned summaries.
+
+    python benchmarks/bench_html_text.py --summaries 50000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from config import load_config
+from html_text import HTMLTextCleaner
+
+FILLER = ("the a of to and in for on with model data system new team said week "
+          "company report users release research product policy market").split()
+
+
+def make_summaries(count, seed):
+    """Feed-style HTML summaries with links, images and entities"""
+    rng = random.Random(seed)
+
+    def sentence(length):
+        return ' '.join(rng.choice(FILLER) for _ in range(length))
+
+    summaries = []
+    for i in range(count):
+        summaries.append(
+            f"<p>{sentence(25).capitalize()} &amp; {sentence(10)}.</p>"
+            f"<p><a href=\"https://example.com/{i}?utm_source=rss&amp;utm_medium=feed\">"
+            f"{sentence(4)}</a> &#8212; {sentence(15)}&nbsp;&hellip;</p>"
+            f"<figure><img src=\"https://cdn.example.com/{i}/hero.jpg\" alt=\"{sentence(6)}\" "
+            f"width=\"1200\" height=\"630\"><figcaption>{sentence(5)}</figcaption></figure>"
+            f"<img src=\"https://pixel.example.com/t.gif?id={i}\" width=\"1\" height=\"1\">"
+        )
+    return summaries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--summaries', type=int, default=50000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    summaries = make_summaries(args.summaries, args.seed)
+    cleaner = HTMLTextCleaner()
+
+    start = time.perf_counter()
+    texts = [cleaner.clean(summary) for summary in summaries]
+    elapsed = time.perf_counter() - start
+    print(f"Clean (cold):   {elapsed:8.3f}s  ({len(summaries) / elapsed:,.0f} summaries/s)")
+
+    start = time.perf_counter()
+    cached = [cleaner.clean(summary) for summary in summaries]
+    elapsed = time.perf_counter() - start
+    print(f"Clean (cached): {elapsed:8.3f}s  ({len(summaries) / elapsed:,.0f} summaries/s)")
+    assert cached == texts
+
+    raw_size = sum(len(summary) for summary in summaries)
+    text_size = sum(len(text) for text in texts)
+    print(f"Summary size:   {raw_size / len(summaries):8.0f} -> {text_size / len(texts):.0f} "
+          f"characters on average ({text_size / raw_size:.0%})")
+
+    matcher = load_config(os.path.join(ROOT, 'config', 'sources.json')).matcher()
+    for label, corpus in (('raw', summaries), ('cleaned', texts)):
+        start = time.perf_counter()
+        for summary in corpus:
+            matcher.scan_fields('', summary.lower())
+        print(f"Scan ({label}):{' ' * (9 - len(label))}{time.perf_counter() - start:8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Benchmark: keyword scoring in filter_relevant_articles
+
+Compares the original per-keyword substring scan with the compiled
+Aho-Corasick matcher on a synthetic corpus, and checks that both produce
+identical scores.
+
+    python benchmarks/bench_keyword_filter.py --articles 100000 --extra-keywords 2000
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from collector import AINewsCollector
+
+FILLER = ("the a of to and in for on with model data system new team said week "
+          "company report users release research product policy market").split()
+
+
+def load_config(extra_keywords, seed):
+    """Default sources.json plus extra_keywords synthetic keywords"""
+    with open(os.path.join(ROOT, 'config', 'sources.json'), 'r') as f:
+        config = json.load(f)
+    rng = random.Random(seed)
+    for i in range(extra_keywords):
+        config['keywords'].append(f"{rng.choice(FILLER)} term{i}")
+    config.setdefault('collection', {})['cache_path'] = None
+    return config
+
+
+def make_corpus(config, count, seed):
+    """Synthetic articles that mix filler words with configured keywords"""
+    rng = random.Random(seed)
+    advanced = config['advanced_filters']
+    vocabulary = (config['keywords'] + advanced['high_priority_keywords'] +
+                  advanced['company_keywords'] + advanced['exclude_keywords'])
+    priorities = ['high', 'medium', 'low']
+
+    def sentence(length):
+        words = [rng.choice(FILLER) for _ in range(length)]
+        for _ in range(rng.randint(0, 3)):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(vocabulary))
+        return ' '.join(words)
+
+    return [{
+        'title': sentence(8).capitalize(),
+        'link': f"https://example.com/article/{i}",
+        'published': f"2025-06-{1 + i % 28:02d}T12:00:00",
+        'summary': sentence(40) + '.',
+        'source': f"Source {i % 25}",
+        'priority': priorities[i % 3]
+    } for i in range(count)]
+
+
+def reference_scores(config, articles):
+    """The original filter: one substring scan per keyword per field"""
+    keywords = [kw.lower() for kw in config['keywords']]
+    advanced = config['advanced_filters']
+    high_priority_kw = [kw.lower() for kw in advanced['high_priority_keywords']]
+    company_kw = [kw.lower() for kw in advanced['company_keywords']]
+    exclude_kw = [kw.lower() for kw in advanced['exclude_keywords']]
+
+    scores = {}
+    for article in articles:
+        title_lower = article['title'].lower()
+        summary_lower = article['summary'].lower()
+        combined_text = title_lower + ' ' + summary_lower
+        if any(excl in combined_text for excl in exclude_kw):
+            continue
+        score = (sum(3 for kw in keywords if kw in title_lower) +
+                 sum(1 for kw in keywords if kw in summary_lower) +
+                 sum(2 for kw in high_priority_kw if kw in combined_text) +
+                 sum(2 for kw in company_kw if kw in combined_text) +
+                 {'high': 2, 'medium': 1}.get(article['priority'], 0))
+        if score >= 2 or article['priority'] == 'high':
+            scores[article['link']] = score
+    return scores
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--articles', type=int, default=100000)
+    parser.add_argument('--extra-keywords', type=int, default=0,
+                        help='synthetic keywords added to the default list')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--skip-reference', action='store_true',
+                        help='only time the compiled matcher')
+    args = parser.parse_args()
+
+    config = load_config(args.extra_keywords, args.seed)
+    articles = make_corpus(config, args.articles, args.seed)
+
+    with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+        json.dump(config, f)
+    try:
+        collector = AINewsCollector(f.name)
+    finally:
+        os.unlink(f.name)
+
+    total_keywords = len(config['keywords']) + sum(
+        len(config['advanced_filters'][key])
+        for key in ('high_priority_keywords', 'company_keywords', 'exclude_keywords'))
+    print(f"Corpus: {len(articles)} articles, {total_keywords} keywords")
+
+    start = time.perf_counter()
+    collector._get_keyword_matcher()
+    print(f"Compile automaton:  {time.perf_counter() - start:8.3f}s")
+
+    start = time.perf_counter()
+    filtered = collector.filter_relevant_articles([dict(a) for a in articles])
+    elapsed = time.perf_counter() - start
+    print(f"Aho-Corasick:       {elapsed:8.3f}s  ({len(articles) / elapsed:,.0f} articles/s)")
+
+    if args.skip_reference:
+        return
+
+    start = time.perf_counter()
+    expected = reference_scores(config, articles)
+    elapsed = time.perf_counter() - start
+    print(f"Substring scan:     {elapsed:8.3f}s  ({len(articles) / elapsed:,.0f} articles/s)")
+
+    actual = {a['link']: a['relevance_score'] for a in filtered}
+    if actual != expected:
+        mismatches = [link for link in expected.keys() | actual.keys()
+                      if expected.get(link) != actual.get(link)]
+        print(f"MISMATCH: {len(mismatches)} articles scored differently, e.g. {mismatches[:3]}")
+        sys.exit(1)
+    print(f"Scores identical for {len(actual)} relevant articles")
+
+
+if __name__ == "__main__":
+    main()
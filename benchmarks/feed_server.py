@@ -0,0 +1,170 @@
+"""
+Local stand-in feed server for benchmarks
+
+Serves deterministic synthetic RSS 2.0 and Atom feeds so the collector can
+be measured without touching the live sources. Every feed is described by
+its URL:
+
+    /feed/<n>.xml?entries=50&latency=0.2&format=atom&days=14
+
+entries  number of items in the feed (default 50)
+latency  seconds to wait before answering (default 0)
+format   'rss' or 'atom' (default rss)
+days     items are spread evenly over this many days back (default 14)
+
+Responses carry an ETag and honour If-None-Match, so conditional-GET
+caching can be benchmarked too.
+
+    python benchmarks/feed_server.py --port 8765
+"""
+
+import argparse
+import hashlib
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+
+WORDS = ("model data system team week company report users release market platform "
+         "agent chip startup paper study lab open source benchmark training inference "
+         "the a of to and in for on with new said").split()
+TERMS = ["GPT", "large language model", "machine learning", "OpenAI", "Anthropic", "Google",
+         "NVIDIA", "breakthrough", "AI safety", "research", "funding", "launches", "regulation",
+         "robotics", "transformer", "multimodal", "tutorial", "crypto", "earnings"]
+
+
+def _sentence(rng, length):
+    words = [rng.choice(WORDS) for _ in range(length)]
+    for _ in range(rng.randint(0, 3)):
+        words.insert(rng.randrange(len(words) + 1), rng.choice(TERMS))
+    return ' '.join(words)
+
+
+def build_feed(feed_id, entries=50, fmt='rss', days=14, now=None):
+    """Return the bytes of a synthetic feed, newest entry first"""
+    rng = random.Random(f"{feed_id}-{entries}-{days}")
+    now = now or datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    step = timedelta(days=days) / max(entries, 1)
+
+    items = []
+    for i in range(entries):
+        title = escape(_sentence(rng, 8).capitalize())
+        summary = escape(f"<p>{_sentence(rng, 40)}.</p><img src=\"https://cdn.example.com/{feed_id}/{i}.png\">")
+        link = f"https://news.example.com/{feed_id}/{i}"
+        published = now - step * i
+        if fmt == 'atom':
+            items.append(
+                f"<entry><title>{title}</title><link href=\"{link}\"/><id>{link}</id>"
+                f"<published>{published.isoformat()}</published><updated>{published.isoformat()}</updated>"
+                f"<summary type=\"html\">{summary}</summary></entry>"
+            )
+        else:
+            items.append(
+                f"<item><title>{title}</title><link>{link}</link><guid>{link}</guid>"
+                f"<pubDate>{format_datetime(published)}</pubDate><description>{summary}</description></item>"
+            )
+
+    if fmt == 'atom':
+        body = (f"<?xml version=\"1.0\" encoding=\"utf-8\"?><feed xmlns=\"http://www.w3.org/2005/Atom\">"
+                f"<title>Feed {feed_id}</title><id>urn:feed:{feed_id}</id><updated>{now.isoformat()}</updated>"
+                f"{''.join(items)}</feed>")
+    else:
+        body = (f"<?xml version=\"1.0\" encoding=\"utf-8\"?><rss version=\"2.0\"><channel>"
+                f"<title>Feed {feed_id}</title><link>https://news.example.com/{feed_id}</link>"
+                f"{''.join(items)}</channel></rss>")
+    return body.encode('utf-8')
+
+
+class _FeedHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        if not url.path.startswith('/feed/'):
+            self.send_error(404)
+            return
+
+        time.sleep(float(params.get('latency', 0)))
+        feed_id = url.path[len('/feed/'):].rsplit('.', 1)[0]
+        fmt = params.get('format', 'rss')
+        body = self.server.feed_body(feed_id, int(params.get('entries', 50)), fmt, int(params.get('days', 14)))
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+
+        if self.headers.get('If-None-Match') == etag:
+            self.server.record_request(0)
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        self.server.record_request(len(body))
+        content_type = 'application/atom+xml' if fmt == 'atom' else 'application/rss+xml'
+        self.send_response(200)
+        self.send_header('Content-Type', f"{content_type}; charset=utf-8")
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class FeedServer(ThreadingHTTPServer):
+    """Threaded HTTP server serving synthetic feeds from a background thread"""
+    daemon_threads = True
+
+    def __init__(self, host='127.0.0.1', port=0):
+        super().__init__((host, port), _FeedHandler)
+        self._bodies = {}
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.bytes_sent = 0
+        self._thread = None
+
+    def feed_body(self, feed_id, entries, fmt, days):
+        # Feeds are generated once so every request for a URL gets the same bytes
+        key = (feed_id, entries, fmt, days)
+        with self._lock:
+            if key not in self._bodies:
+                self._bodies[key] = build_feed(feed_id, entries, fmt, days)
+            return self._bodies[key]
+
+    def record_request(self, size):
+        with self._lock:
+            self.requests += 1
+            self.bytes_sent += size
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def url(self, feed_id, host=None, **params):
+        query = '&'.join(f"{key}={value}" for key, value in params.items())
+        host = host or self.server_address[0]
+        return f"http://{host}:{self.server_address[1]}/feed/{feed_id}.xml" + (f"?{query}" if query else '')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve synthetic RSS/Atom feeds")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    server = FeedServer(args.host, args.port)
+    print(f"Serving synthetic feeds on {server.url('example', entries=50, format='rss')}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
@@ -0,0 +1,192 @@
+"""
+Offline benchmark suite for the AI News Monitor pipeline
+
+Starts a local feed server (benchmarks/feed_server.py) with synthetic RSS
+and Atom feeds, points a temporary copy of config/sources.json at it and
+measures each stage in isolation plus the full main.py pipeline:
+
+    collect        AINewsCollector.collect_rss_feeds
+    filter         AINewsCollector.filter_relevant_articles
+    text_summary   AINewsSummarizer.create_text_summary
+    word_document  AINewsSummarizer.create_word_document
+    notebooklm     create_notebooklm_assets
+    pipeline       main.main()
+
+For every stage it reports latency percentiles over --repeat runs,
+throughput in articles per second and peak traced memory.
+
+    python benchmarks/run_benchmarks.py --feeds 50 --entries 100 --latency 0.05
+    python benchmarks/run_benchmarks.py --stages filter text_summary --json results.json
+"""
+
+import argparse
+import contextlib
+import copy
+import io
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from feed_server import FeedServer
+
+STAGES = ['collect', 'filter', 'text_summary', 'word_document', 'notebooklm', 'pipeline']
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def measure(name, run, items, repeat, setup=None):
+    """Time run(setup()) repeat times, then once more under tracemalloc"""
+    timings = []
+    for _ in range(repeat):
+        args = setup() if setup else ()
+        start = time.perf_counter()
+        run(*args)
+        timings.append(time.perf_counter() - start)
+
+    args = setup() if setup else ()
+    tracemalloc.start()
+    run(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    p50 = percentile(timings, 50)
+    return {
+        'stage': name,
+        'items': items,
+        'runs': repeat,
+        'p50_ms': p50 * 1000,
+        'p95_ms': percentile(timings, 95) * 1000,
+        'max_ms': max(timings) * 1000,
+        'items_per_s': items / p50 if p50 else 0.0,
+        'peak_mib': peak / (1024 * 1024)
+    }
+
+
+def write_config(workdir, server, args):
+    """Copy config/sources.json with its feeds replaced by synthetic ones"""
+    with open(os.path.join(ROOT, 'config', 'sources.json'), 'r') as f:
+        config = json.load(f)
+
+    config['rss_feeds'] = [{
+        'name': f"Synthetic Feed {i}",
+        'url': server.url(i, entries=args.entries, latency=args.latency,
+                          format='atom' if i % 2 else 'rss', days=args.days),
+        'priority': ['high', 'medium', 'low'][i % 3],
+        'category': 'news'
+    } for i in range(args.feeds)]
+
+    collection = config.setdefault('collection', {})
+    collection['per_host_delay'] = args.per_host_delay
+    collection['max_workers'] = args.workers
+    if not args.with_cache:
+        collection['cache_path'] = None
+        collection.setdefault('html_text', {})['cache_path'] = None
+        config.setdefault('output', {}).setdefault('render_cache', {})['enabled'] = False
+
+    os.makedirs(os.path.join(workdir, 'config'))
+    with open(os.path.join(workdir, 'config', 'sources.json'), 'w') as f:
+        json.dump(config, f, indent=2)
+
+
+def print_report(results):
+    header = f"{'stage':<14}{'items':>8}{'p50 ms':>11}{'p95 ms':>11}{'max ms':>11}{'items/s':>12}{'peak MiB':>10}"
+    print(header)
+    print('-' * len(header))
+    for r in results:
+        print(f"{r['stage']:<14}{r['items']:>8}{r['p50_ms']:>11.1f}{r['p95_ms']:>11.1f}"
+              f"{r['max_ms']:>11.1f}{r['items_per_s']:>12,.0f}{r['peak_mib']:>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline against a local feed server")
+    parser.add_argument('--feeds', type=int, default=25)
+    parser.add_argument('--entries', type=int, default=50, help='entries per feed')
+    parser.add_argument('--latency', type=float, default=0.05, help='server delay per request (s)')
+    parser.add_argument('--days', type=int, default=14, help='spread of entry dates (days back)')
+    parser.add_argument('--workers', type=int, default=8, help='collection.max_workers')
+    parser.add_argument('--per-host-delay', type=float, default=0.0,
+                        help='collection.per_host_delay (all synthetic feeds share one host)')
+    parser.add_argument('--with-cache', action='store_true', help='keep the conditional-GET feed cache, HTML text cache and render cache on')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=STAGES)
+    parser.add_argument('--json', metavar='PATH', help='also write results as JSON')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    server = FeedServer().start()
+    workdir = tempfile.mkdtemp(prefix='ai-news-bench-')
+    cwd = os.getcwd()
+    results = []
+    try:
+        write_config(workdir, server, args)
+        os.chdir(workdir)
+        for directory in ('data', 'outputs', 'logs'):
+            os.makedirs(directory)
+
+        from collector import AINewsCollector
+        from summarizer import AINewsSummarizer
+        from notebooklm_generator import create_notebooklm_assets
+
+        collector = AINewsCollector()
+        articles = collector.collect_rss_feeds(days_back=7)
+        relevant = collector.filter_relevant_articles(copy.deepcopy(articles))
+        summarizer = AINewsSummarizer()
+        print(f"Corpus: {args.feeds} feeds x {args.entries} entries, "
+              f"{len(articles)} in window, {len(relevant)} relevant\n")
+
+        if 'collect' in args.stages:
+            results.append(measure('collect', lambda: collector.collect_rss_feeds(days_back=7),
+                                   args.feeds * args.entries, args.repeat))
+        if 'filter' in args.stages:
+            results.append(measure('filter', collector.filter_relevant_articles, len(articles),
+                                   args.repeat, setup=lambda: (copy.deepcopy(articles),)))
+        if 'text_summary' in args.stages:
+            results.append(measure('text_summary', summarizer.create_text_summary, len(relevant),
+                                   args.repeat, setup=lambda: (copy.deepcopy(relevant),)))
+        if 'word_document' in args.stages:
+            results.append(measure('word_document', summarizer.create_word_document, len(relevant),
+                                   args.repeat, setup=lambda: (copy.deepcopy(relevant),)))
+        if 'notebooklm' in args.stages:
+            def notebooklm(batch):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    create_notebooklm_assets(batch)
+            results.append(measure('notebooklm', notebooklm, len(relevant),
+                                   args.repeat, setup=lambda: (copy.deepcopy(relevant),)))
+        if 'pipeline' in args.stages:
+            import main as pipeline
+
+            def run_pipeline():
+                with contextlib.redirect_stdout(io.StringIO()):
+                    pipeline.main([])
+            results.append(measure('pipeline', run_pipeline, args.feeds * args.entries, args.repeat))
+    finally:
+        os.chdir(cwd)
+        server.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print_report(results)
+    print(f"\nFeed server: {server.requests} requests, {server.bytes_sent / (1024 * 1024):.1f} MiB sent")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'settings': vars(args), 'results': results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
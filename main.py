@@ -3,16 +3,27 @@ AI News Monitor - Main Workflow
 Run this script weekly to generate AI news summaries
 """
 
+import argparse
 import os
 import sys
-from datetime import datetime
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta
 import logging
 
-# Add src directory to path
-sys.path.append('src')
+# Add src directory to path, once and independent of the working directory
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
 
+# These modules load their heavy dependencies (feedparser, requests,
+# python-docx) only when a stage actually needs them
 from collector import AINewsCollector
-from summarizer import AINewsSummarizer
+from config import load_config
+from digest import ArticleDigest
+from metrics import RunMetrics
+from render_cache import RenderCache
+from summarizer import AINewsSummarizer, RENDER_VERSION as SUMMARY_RENDER_VERSION
 
 def setup_directories():
     """Create necessary directories if they don't exist"""
@@ -45,76 +56,387 @@ def setup_logging():
         logger.warning(f"Could not create log file, using console only: {e}")
         return logger
 
-def main():
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Collect and summarize AI news")
+    parser.add_argument('--days-back', type=int, default=7,
+                        help='number of days to look back for articles (default: 7)')
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--stream', action='store_true',
+                      help='stream articles feed by feed into a bounded digest; '
+                           'memory stays flat for thousands of feeds')
+    mode.add_argument('--incremental', action='store_true',
+                      help='only score entries newer than each feed\'s watermark and '
+                           'merge them with the archived window')
+    mode.add_argument('--sharded', action='store_true',
+                      help='collect through the local work queue with several worker processes; '
+                           'more local workers can join with src/work_queue.py')
+    mode.add_argument('--from-archive', action='store_true',
+                      help='re-render the outputs from the archived window without fetching feeds')
+    mode.add_argument('--profiles', action='store_true',
+                      help='rank the collected articles for every scoring profile in '
+                           'sources.json and save one JSON file per profile')
+    mode.add_argument('--daemon', action='store_true',
+                      help='keep running: poll each feed on its own adaptive schedule and '
+                           're-render the outputs as new articles arrive (SIGUSR1 renders now)')
+    parser.add_argument('--top', type=int, metavar='N',
+                        help='keep only the N highest-scoring articles')
+    parser.add_argument('--workers', type=int, metavar='N',
+                        help='local worker processes for --sharded (default: sharding.workers)')
+    args = parser.parse_args(argv)
+    if args.top is not None and args.top < 1:
+        parser.error("--top must be at least 1")
+    return args
+
+def collect_streaming(collector, days_back, logger, metrics):
+    """Steps 1-3 in streaming mode: fetch, filter and archive article by article
+    
+    Only the bounded ArticleDigest the renderers need is kept in memory.
+    Near-duplicate collapsing needs the full article set and is skipped, and
+    collector should run without the feed cache (see main), which would
+    otherwise hold every feed's entries.
+    Fetching, scoring and archiving interleave, so they are timed as one stage.
+    """
+    digest = ArticleDigest(collector.classifier)
+    with metrics.stage('collect'):
+        articles = collector.iter_rss_feeds(days_back=days_back)
+        relevant = collector.iter_relevant_articles(articles)
+        digest.extend(collector.archive_articles(relevant))
+    logger.info(f"Streamed {digest.total} relevant articles")
+    
+    if not digest.total:
+        return digest, None
+    
+    cutoff_date = datetime.now() - timedelta(days=days_back)
+    with metrics.stage('save'):
+        data_file = collector.export_articles(since=cutoff_date)
+    return digest, data_file
+
+def collect_incremental(collector, days_back, logger, metrics):
+    """Steps 1-3 in incremental mode: only entries past each feed's watermark
+    are scored, then merged with the archived window for rendering
+    """
+    with metrics.stage('collect'):
+        articles = collector.collect_rss_feeds(days_back=days_back, incremental=True)
+    with metrics.stage('filter'):
+        new_articles = collector.filter_relevant_articles(articles)
+    with metrics.stage('save'):
+        relevant_articles = collector.merge_with_archive(new_articles, days_back=days_back)
+        
+        # Advance watermarks only once the new articles are safely archived
+        collector.commit_watermarks()
+    
+    if not relevant_articles:
+        return relevant_articles, None
+    
+    with metrics.stage('dedup'):
+        relevant_articles = collector.collapse_duplicates(relevant_articles)
+    with metrics.stage('save'):
+        data_file = collector.export_articles(links=[article['link'] for article in relevant_articles])
+    return relevant_articles, data_file
+
+def collect_profiles(collector, days_back, limit, logger, metrics):
+    """Collect once and save a ranked article list for every scoring profile"""
+    with metrics.stage('collect'):
+        articles = collector.collect_rss_feeds(days_back=days_back)
+    if not articles:
+        logger.warning("No articles collected. Exiting.")
+        return {}
+    
+    with metrics.stage('filter'):
+        ranked = collector.rank_profiles(articles, limit=limit)
+    with metrics.stage('dedup'):
+        ranked = {name: collector.collapse_duplicates(profile_articles)
+                  for name, profile_articles in ranked.items()}
+    with metrics.stage('save'):
+        filenames = collector.save_profile_articles(ranked)
+    
+    for name, filename in filenames.items():
+        logger.info(f"Profile {name}: {len(ranked[name])} articles in {filename}")
+    return filenames
+
+def open_render_cache(config):
+    """RenderCache configured by output.render_cache, or None when disabled"""
+    settings = config.get('output', {}).get('render_cache', {})
+    if not settings.get('enabled', True):
+        return None
+    return RenderCache(
+        settings.get('path', 'data/render_cache'),
+        context=config,
+        max_entries=settings.get('max_entries', 50),
+        max_fragments=settings.get('max_fragments', 2000)
+    )
+
+def _cached_render(cache, name, version, digest, render):
+    """Return render(fragments) unless cache already holds its result
+    
+    The cached files are copied back when the digest, the config, the
+    renderer version and the render date all match an earlier render. The
+    date is part of the key because outputs carry it in their file names
+    and headers.
+    """
+    if cache is None:
+        return render(None)
+    
+    logger = logging.getLogger(__name__)
+    key = cache.key(name, version, datetime.now().strftime('%Y%m%d'), digest.fingerprint())
+    result = cache.restore(key)
+    if result is not None:
+        logger.info(f"{name} unchanged since the last render, reused the cached output")
+        return result
+    
+    fragments = cache.fragments(name)
+    result = render(fragments)
+    try:
+        fragments.save()
+        cache.store(key, result)
+    except OSError as e:
+        logger.warning(f"Could not cache {name}: {e}")
+    return result
+
+def render_text_summary(digest, cache=None):
+    """Write the text summary and return its path"""
+    text_output = f"outputs/AI_Industry_Weekly_{datetime.now().strftime('%Y%m%d')}.txt"
+    
+    def render(fragments):
+        summarizer = AINewsSummarizer(fragments)
+        with open(text_output, 'w') as f:
+            summarizer.write_text_summary(digest, f)
+        logging.getLogger(__name__).info(f"Text summary saved to {text_output}")
+        return text_output
+    
+    return _cached_render(cache, 'text_summary', SUMMARY_RENDER_VERSION, digest, render)
+
+def render_word_document(digest, cache=None):
+    """Write the Word document (no spaces in the name for GitHub compatibility)"""
+    def render(fragments):
+        summarizer = AINewsSummarizer()
+        return summarizer.create_word_document(digest, custom_name="AI_Weekly_News_Summary")
+    
+    return _cached_render(cache, 'word_document', SUMMARY_RENDER_VERSION, digest, render)
+
+def render_notebooklm(digest, cache=None):
+    """Write the NotebookLM script and summary and return both paths"""
+    from notebooklm_generator import create_notebooklm_assets, RENDER_VERSION
+    
+    def render(fragments):
+        logging.getLogger(__name__).info("📝 Creating NotebookLM-optimized script and summary...")
+        return create_notebooklm_assets(digest, fragments)
+    
+    return _cached_render(cache, 'notebooklm', RENDER_VERSION, digest, render)
+
+# Output stage: every renderer reads the same digest, so they run side by side
+RENDERERS = [
+    ('text_summary', render_text_summary),
+    ('word_document', render_word_document),
+    ('notebooklm', render_notebooklm)
+]
+
+def _timed_render(renderer, digest, cache=None):
+    start = time.perf_counter()
+    result = renderer(digest, cache)
+    return result, time.perf_counter() - start
+
+def _render_executor(kind, logger):
+    """Pool for the output stage: 'process' (default), 'thread' or 'none'"""
+    if kind == 'none':
+        return None
+    if kind == 'process':
+        try:
+            return ProcessPoolExecutor(max_workers=len(RENDERERS))
+        except (OSError, NotImplementedError) as e:
+            logger.warning(f"Process pool unavailable, rendering in threads: {e}")
+    return ThreadPoolExecutor(max_workers=len(RENDERERS))
+
+def render_outputs(digest, metrics, logger, executor='process', cache=None):
+    """Render every output format concurrently
+    
+    python-docx generation is CPU bound, so renderers run in separate
+    processes by default and the stage takes as long as the slowest one.
+    A failing renderer is logged and leaves the others untouched. With a
+    RenderCache, renderers whose inputs are unchanged reuse their last output.
+    Returns {name: result} for the renderers that succeeded.
+    """
+    results = {}
+    pool = _render_executor(executor, logger)
+    try:
+        if pool is not None:
+            futures = {name: pool.submit(_timed_render, renderer, digest, cache) for name, renderer in RENDERERS}
+        
+        for name, renderer in RENDERERS:
+            try:
+                if pool is not None:
+                    result, seconds = futures[name].result()
+                else:
+                    result, seconds = _timed_render(renderer, digest, cache)
+            except Exception as e:
+                if name == 'notebooklm' and isinstance(e, ImportError):
+                    logger.info("💡 To enable NotebookLM generation, save the NotebookLM generator code as 'notebooklm_generator.py'")
+                else:
+                    logger.warning(f"{name} generation error: {e}")
+                continue
+            results[name] = result
+            metrics.add_stage(name, seconds)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    
+    if not results:
+        raise RuntimeError("Every output renderer failed")
+    return results
+
+def load_from_archive(days_back, logger, metrics):
+    """Steps 1-3 replaced by a read of the archive: no feeds, no collector
+    
+    Archived articles are already scored and classified, so this only
+    loads the window and collapses near-duplicates before rendering.
+    """
+    from article import Article
+    from article_store import ArticleStore
+    from dedup import NearDuplicateDetector
+    
+    config = load_config().data
+    cutoff_date = datetime.now() - timedelta(days=days_back)
+    with metrics.stage('load'):
+        with ArticleStore(config.get('archive', {}).get('db_path', 'data/articles.db')) as store:
+            articles = [Article.from_dict(row) for row in store.query(since=cutoff_date)]
+    logger.info(f"Loaded {len(articles)} archived articles")
+    
+    if articles and config.get('dedup', {}).get('enabled', True):
+        with metrics.stage('dedup'):
+            articles = NearDuplicateDetector.from_config(config).collapse(articles)
+    return articles
+
+def run_daemon(days_back, logger):
+    """Continuous mode: adaptive per-feed polling with a rolling digest"""
+    from daemon import NewsDaemon
+    
+    collector = AINewsCollector()
+    executor = collector.config.get('output', {}).get('executor', 'process')
+    render_cache = open_render_cache(collector.config)
+    
+    def render(digest):
+        metrics = RunMetrics()
+        with metrics.stage('render'):
+            render_outputs(digest, metrics, logger, executor, render_cache)
+        logger.info(f"Rendered digest of {digest.total} articles")
+    
+    settings = collector.config.get('daemon', {})
+    daemon = NewsDaemon(
+        collector,
+        days_back=days_back,
+        render=render,
+        render_interval=settings.get('render_interval', 3600),
+        min_poll_interval=settings.get('min_poll_interval', 600),
+        max_poll_interval=settings.get('max_poll_interval', 6 * 3600)
+    )
+    daemon.run()
+
+def main(argv=None):
     """Main workflow"""
+    args = parse_args(argv)
     setup_directories()  # Create directories BEFORE logging
     logger = setup_logging()
     
+    if args.daemon:
+        run_daemon(args.days_back, logger)
+        return
+    
+    metrics = RunMetrics()
+    
     try:
         logger.info("Starting AI News collection and summarization...")
         
-        # Step 1: Collect articles
-        collector = AINewsCollector()
-        articles = collector.collect_rss_feeds(days_back=7)
+        # Re-rendering from the archive needs neither feeds nor a collector
+        # Streaming skips the feed cache, whose parsed entries grow with the feed count
+        collector = None if args.from_archive else AINewsCollector(metrics=metrics,
+                                                                   use_feed_cache=not args.stream)
         
-        if not articles:
-            logger.warning("No articles collected. Exiting.")
+        if args.profiles:
+            collect_profiles(collector, args.days_back, args.top, logger, metrics)
             return
-        
-        # Step 2: Filter relevant articles
-        relevant_articles = collector.filter_relevant_articles(articles)
-        
-        if not relevant_articles:
-            logger.warning("No relevant articles found. Exiting.")
-            return
-        
-        # Step 3: Save raw data
-        data_file = collector.save_articles(relevant_articles)
-        
-        # Step 4: Generate summary with custom names
-        summarizer = AINewsSummarizer()
-        
-        # Create text summary
-        text_summary = summarizer.create_text_summary(relevant_articles)
-        text_output = f"outputs/AI_Industry_Weekly_{datetime.now().strftime('%Y%m%d')}.txt"
-        with open(text_output, 'w') as f:
-            f.write(text_summary)
-        logger.info(f"Text summary saved to {text_output}")
-        
-        # Create Word document with custom name (no spaces for GitHub compatibility)
-        doc_output = summarizer.create_word_document(
-            relevant_articles, 
-            custom_name="AI_Weekly_News_Summary"
-        )
-        
-        # Step 5: Generate NotebookLM Assets
-        try:
-            sys.path.append('.')  # Add current directory to path
-            from notebooklm_generator import create_notebooklm_assets
+        elif args.from_archive:
+            relevant_articles = load_from_archive(args.days_back, logger, metrics)
+            if not relevant_articles:
+                logger.warning("No archived articles in the window. Exiting.")
+                return
+            total_articles = len(relevant_articles)
+        elif args.stream:
+            relevant_articles, data_file = collect_streaming(collector, args.days_back, logger, metrics)
+            if not relevant_articles.total:
+                logger.warning("No relevant articles found. Exiting.")
+                return
+            total_articles = relevant_articles.total
+        elif args.incremental:
+            relevant_articles, data_file = collect_incremental(collector, args.days_back, logger, metrics)
+            if not relevant_articles:
+                logger.warning("No relevant articles found. Exiting.")
+                return
+            total_articles = len(relevant_articles)
+        else:
+            # Step 1: Collect articles
+            with metrics.stage('collect'):
+                if args.sharded:
+                    articles = collector.collect_sharded(days_back=args.days_back, workers=args.workers)
+                else:
+                    articles = collector.collect_rss_feeds(days_back=args.days_back)
             
-            logger.info("📝 Creating NotebookLM-optimized script and summary...")
-            script_path, summary_path = create_notebooklm_assets(relevant_articles)
+            if not articles:
+                logger.warning("No articles collected. Exiting.")
+                return
             
-            logger.info(f"✅ NotebookLM Script: {script_path}")
-            logger.info(f"✅ NotebookLM Summary: {summary_path}")
-            logger.info("🎙️ Ready for NotebookLM podcast generation!")
-                
-        except ImportError:
-            logger.info("💡 To enable NotebookLM generation, save the NotebookLM generator code as 'notebooklm_generator.py'")
-        except Exception as e:
-            logger.warning(f"NotebookLM generation error: {e}")
+            # Step 2: Filter relevant articles
+            with metrics.stage('filter'):
+                relevant_articles = collector.filter_relevant_articles(articles, limit=args.top)
+            
+            if not relevant_articles:
+                logger.warning("No relevant articles found. Exiting.")
+                return
+            
+            # Collapse the same story reported by several sources
+            with metrics.stage('dedup'):
+                relevant_articles = collector.collapse_duplicates(relevant_articles)
+            total_articles = len(relevant_articles)
+            
+            # Step 3: Save raw data
+            with metrics.stage('save'):
+                data_file = collector.save_articles(relevant_articles)
+        
+        # Steps 4-5: Render the text summary, Word document and NotebookLM assets.
+        # Renderers only show the top articles per category, so build that
+        # bounded digest once and hand the same small object to each of them.
+        if not isinstance(relevant_articles, ArticleDigest):
+            classifier = collector.classifier if collector else None
+            relevant_articles = ArticleDigest.from_articles(relevant_articles, classifier)
+        
+        config = load_config().data
+        executor = config.get('output', {}).get('executor', 'process')
+        with metrics.stage('render'):
+            outputs = render_outputs(relevant_articles, metrics, logger, executor,
+                                     open_render_cache(config))
         
         logger.info("AI News summary generation completed successfully!")
-        logger.info(f"Text summary: {text_output}")
-        logger.info(f"Word document: {doc_output}")
-        if 'script_path' in locals() and script_path:
+        if 'text_summary' in outputs:
+            logger.info(f"Text summary: {outputs['text_summary']}")
+        if 'word_document' in outputs:
+            logger.info(f"Word document: {outputs['word_document']}")
+        if 'notebooklm' in outputs:
+            script_path, summary_path = outputs['notebooklm']
             logger.info(f"📝 NotebookLM Script: {script_path}")
             logger.info(f"📄 NotebookLM Summary: {summary_path}")
-        logger.info(f"Total articles processed: {len(relevant_articles)}")
+            logger.info("🎙️ Ready for NotebookLM podcast generation!")
+        logger.info(f"Total articles processed: {total_articles}")
         
     except Exception as e:
         logger.error(f"Error in main workflow: {e}")
         raise
+    finally:
+        # Metrics are written even for failed or empty runs; those are the ones worth inspecting
+        try:
+            json_path, prom_path = metrics.write('outputs')
+            logger.info(f"Run metrics: {json_path}, {prom_path}")
+        except OSError as e:
+            logger.warning(f"Could not write run metrics: {e}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
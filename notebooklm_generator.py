@@ -1,362 +1,339 @@
 import json
+import os
+import sys
 from datetime import datetime
 import logging
 import re
 
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src')
+if SRC_DIR not in sys.path:
+    sys.path.append(SRC_DIR)
+from classifier import ArticleClassifier
+from digest import ArticleDigest
+from templates import Template, plural
+
+# Part of every RenderCache key; bump it whenever the script or summary
+# document changes for the same articles
+RENDER_VERSION = 1
+
+# Static script text, parsed once at import instead of rebuilt per call
+SCRIPT_HEADER = Template("""# AI Industry Weekly Podcast Script
+**Date:** {date}
+**Total Stories Covered:** {total}
+
+## Podcast Overview
+This week's AI industry update covers major developments across artificial intelligence, machine learning, and emerging technologies. We'll explore breakthrough research, significant company announcements, policy developments, and market trends that are shaping the future of AI.
+
+---
+
+## Executive Summary
+
+### Key Themes This Week:
+""")
+
+SECTION_ORDER = ['breaking', 'research', 'industry', 'funding', 'tools', 'policy', 'trends', 'people']
+
+SECTION_HEADINGS = {
+    'breaking': '## 🚨 Breaking News & Major Announcements\n\n',
+    'research': '## 🔬 Research Breakthroughs & Academic Developments\n\n',
+    'industry': '## 🏢 Industry News & Company Updates\n\n',
+    'funding': '## 💰 Investment & Funding News\n\n',
+    'tools': '## 🛠️ New Tools & Platforms\n\n',
+    'policy': '## 📋 Policy, Ethics & Regulation\n\n',
+    'trends': '## 📈 Market Trends & Analysis\n\n',
+    'people': '## 👥 Leadership & People News\n\n'
+}
+
+SECTION_CONTEXTS = {
+    'breaking': Template("This week brought {count} major announcement{s} that are already making waves across the AI industry. These developments represent significant shifts in capabilities, market positioning, and technological advancement."),
+    'research': Template("The academic and research community published {count} notable development{s} this week. These findings provide crucial insights into the future direction of AI technology and its underlying scientific foundations."),
+    'industry': Template("Corporate developments dominated headlines with {count} significant update{s} from major tech companies. These moves signal important strategic shifts and competitive positioning in the AI landscape."),
+    'funding': Template("The investment landscape saw {count} noteworthy development{s} this week, reflecting continued confidence in AI innovation and market potential."),
+    'tools': Template("Developers and practitioners gained access to {count} new tool{s} and platform{s} this week, expanding the practical applications of AI technology."),
+    'policy': Template("Regulatory and ethical considerations took center stage with {count} important development{s} in AI governance and policy formation."),
+    'trends': Template("Market analysis revealed {count} significant trend{s} shaping the broader AI ecosystem and its future trajectory."),
+    'people': Template("Leadership changes and key personnel moves made news with {count} important announcement{s} across the industry.")
+}
+DEFAULT_SECTION_CONTEXT = Template("This section covers {count} important development{s} in {category}.")
+
+PRIORITY_CONTEXT = {
+    'Critical': '**🚨 CRITICAL DEVELOPMENT**\n\n',
+    'High': '**⭐ HIGH IMPACT**\n\n',
+    'Medium': '**📢 NOTABLE**\n\n',
+    'Low': '**📋 UPDATE**\n\n'
+}
+
+DISCUSSION_PROMPTS = {
+    'breaking': [
+        "- What makes this announcement particularly significant for the AI industry?",
+        "- How might this impact existing market players and competitive dynamics?",
+        "- What are the potential implications for developers and end users?"
+    ],
+    'research': [
+        "- What new possibilities does this research unlock?",
+        "- How might this advance translate into practical applications?",
+        "- What are the broader scientific implications of these findings?"
+    ],
+    'industry': [
+        "- What strategic motivations might be driving this move?",
+        "- How does this fit into the company's broader AI strategy?",
+        "- What signal does this send to the market and competitors?"
+    ],
+    'funding': [
+        "- What does this investment say about market confidence in AI?",
+        "- How might this funding accelerate development in this space?",
+        "- What trends does this reflect in AI investment patterns?"
+    ]
+}
+DEFAULT_DISCUSSION_PROMPTS = [
+    "- What are the key implications of this development?",
+    "- How might this impact the broader AI ecosystem?",
+    "- What should industry watchers pay attention to next?"
+]
+
+IMPLICATIONS = {
+    'Critical': "This development has the potential to significantly reshape competitive dynamics and market positioning across the AI industry.",
+    'High': "This represents an important shift that industry participants should monitor closely for strategic implications.",
+    'Medium': "This development contributes to ongoing trends and may influence future industry direction.",
+    'Low': "While incremental, this update reflects broader patterns in AI industry evolution."
+}
+DEFAULT_IMPLICATION = "This development adds to the evolving AI landscape and merits industry attention."
+
+# Key takeaways shown for each podcast category present this week
+TAKEAWAYS = [
+    ('breaking', "**Major Announcements:** This week's breakthrough announcements signal accelerating innovation and intensifying competition in the AI space. The pace of development continues to exceed industry expectations.\n\n"),
+    ('research', "**Research Progress:** Academic and research developments this week demonstrate continued advancement in AI capabilities and our understanding of these systems. These findings will likely influence practical applications in the coming months.\n\n"),
+    ('funding', "**Investment Climate:** Funding activity reflects sustained investor confidence in AI innovation, with particular interest in practical applications and enterprise solutions.\n\n"),
+    ('policy', "**Regulatory Environment:** Policy developments indicate growing attention to AI governance and ethical considerations, which will increasingly shape industry practices.\n\n")
+]
+
+CONCLUSION_BODY = """### Industry Implications
+
+The developments covered this week reflect several important trends:
+
+- **Acceleration:** The pace of AI innovation continues to accelerate across research, development, and deployment
+- **Democratization:** New tools and platforms are making AI capabilities more accessible to broader audiences
+- **Maturation:** The industry is showing signs of maturation with increased focus on practical applications and governance
+- **Competition:** Competitive dynamics are intensifying as major players vie for market position
+
+### What to Watch Next Week
+
+Based on this week's developments, here are key areas to monitor:
+
+- Follow-up announcements and product releases from major AI companies
+- Market reactions and competitive responses to breakthrough developments
+- Academic publications building on this week's research findings
+- Policy responses to emerging AI capabilities and applications
+- Investment and funding activity in emerging AI sectors
+
+### Conclusion
+
+"""
+
+CONCLUSION_END = Template("This week's {total} developments underscore the dynamic nature of the AI industry. "
+                          "From breakthrough research to major corporate announcements, the pace of change continues to accelerate. "
+                          "As AI capabilities expand and mature, we're seeing increased focus on practical applications, "
+                          "ethical considerations, and competitive positioning.\n\n"
+                          "The industry remains in a period of rapid evolution, with each week bringing significant "
+                          "developments that shape the future of artificial intelligence and its impact on society.\n\n")
+
+SUMMARY_DOCUMENT_HEADER = Template("""AI Industry Weekly Summary - {date}
+
+OVERVIEW
+========
+This document summarizes {total} key developments in artificial intelligence from the past week.
+
+MAJOR DEVELOPMENTS
+==================
+""")
+
+NUMBERING_RE = re.compile(r'^\d+\.\s*')
+TITLE_EMOJI_RE = re.compile(r'[🔥⭐]')
+
 class NotebookLMScriptGenerator:
-    def __init__(self):
+    def __init__(self, fragments=None):
         self.logger = logging.getLogger(__name__)
+        self.classifier = ArticleClassifier()
+        # Optional FragmentCache reusing article blocks of earlier scripts
+        self.fragments = fragments
     
     def create_notebooklm_script(self, articles, output_path=None):
-        """Create a comprehensive script optimized for NotebookLM podcast generation"""
+        """Create a comprehensive script optimized for NotebookLM podcast generation
+        
+        articles may be a list or an ArticleDigest.
+        """
         
         if output_path is None:
             date_str = datetime.now().strftime('%Y%m%d')
             output_path = f"outputs/NotebookLM_Script_{date_str}.md"
         
-        # Categorize articles
-        categories = self._categorize_articles(articles)
-        
-        # Build comprehensive script
-        script = self._build_comprehensive_script(categories, articles)
+        # Categorize articles, keeping only what the script renders
+        digest = self._as_digest(articles)
         
-        # Save script
+        # Stream the comprehensive script straight to disk
         with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(script)
+            self._write_comprehensive_script(f, digest.podcast_categories, digest.total)
         
         self.logger.info(f"✅ NotebookLM script saved to: {output_path}")
         
         # Also create a summary document for context
         summary_path = output_path.replace('Script', 'Summary').replace('.md', '.txt')
-        self._create_summary_document(articles, summary_path)
+        self._create_summary_document(digest, summary_path)
         
         return output_path, summary_path
     
-    def _categorize_articles(self, articles):
-        """Enhanced categorization for better podcast flow"""
-        categories = {
-            'breaking': [],      # Major announcements & breaking news
-            'research': [],      # Academic papers and studies  
-            'industry': [],      # Company news and products
-            'policy': [],        # Regulation and governance
-            'trends': [],        # Market trends and analysis
-            'tools': [],         # New tools and applications
-            'funding': [],       # Investment and funding news
-            'people': []         # Leadership changes, interviews
-        }
-        
-        for article in articles:
-            text = (article['title'] + ' ' + article.get('summary', '')).lower()
-            priority = article.get('priority_level', 'Medium')
-            
-            # Categorize based on content and priority
-            if priority == 'Critical' or any(kw in text for kw in ['breaking', 'announces', 'launches', 'releases', 'unveils']):
-                categories['breaking'].append(article)
-            elif any(kw in text for kw in ['arxiv', 'research', 'paper', 'study', 'academic', 'university']):
-                categories['research'].append(article)
-            elif any(kw in text for kw in ['funding', 'investment', 'raises', 'series', 'valuation', 'ipo']):
-                categories['funding'].append(article)
-            elif any(kw in text for kw in ['regulation', 'policy', 'law', 'ethics', 'governance', 'government']):
-                categories['policy'].append(article)
-            elif any(kw in text for kw in ['trend', 'market', 'analysis', 'forecast', 'prediction', 'outlook']):
-                categories['trends'].append(article)
-            elif any(kw in text for kw in ['tool', 'app', 'platform', 'api', 'framework', 'library']):
-                categories['tools'].append(article)
-            elif any(kw in text for kw in ['ceo', 'cto', 'founder', 'hire', 'joins', 'interview', 'appoint']):
-                categories['people'].append(article)
-            else:
-                categories['industry'].append(article)
-        
-        return categories
+    def _as_digest(self, articles):
+        """Accept either an article list or an ArticleDigest"""
+        if isinstance(articles, ArticleDigest):
+            return articles
+        return ArticleDigest.from_articles(articles, self.classifier)
     
-    def _build_comprehensive_script(self, categories, all_articles):
-        """Build a rich, conversational script for NotebookLM"""
-        
-        date_str = datetime.now().strftime('%B %d, %Y')
-        total_articles = len(all_articles)
+    def _write_comprehensive_script(self, out, categories, total_articles):
+        """Stream the podcast script to out
         
-        script = f"""# AI Industry Weekly Podcast Script
-**Date:** {date_str}
-**Total Stories Covered:** {total_articles}
-
-## Podcast Overview
-This week's AI industry update covers major developments across artificial intelligence, machine learning, and emerging technologies. We'll explore breakthrough research, significant company announcements, policy developments, and market trends that are shaping the future of AI.
-
----
-
-## Executive Summary
-
-### Key Themes This Week:
-"""
+        categories maps each podcast category to a TopK bucket.
+        """
+        SCRIPT_HEADER.write(out, date=datetime.now().strftime('%B %d, %Y'), total=total_articles)
         
         # Add thematic overview
-        for category, articles in categories.items():
-            if articles:
-                count = len(articles)
-                script += f"- **{category.title()}**: {count} major development{'s' if count > 1 else ''}\n"
+        for category, bucket in categories.items():
+            if bucket.total:
+                out.write(f"- **{category.title()}**: {bucket.total} major development{plural(bucket.total)}\n")
         
-        script += f"\n### Market Context\n"
-        script += f"The AI industry continues its rapid evolution with {total_articles} significant developments this week. "
+        out.write("\n### Market Context\n")
+        out.write(f"The AI industry continues its rapid evolution with {total_articles} significant developments this week. ")
         
         # Add high-level insights
-        critical_count = len(categories.get('breaking', []))
-        research_count = len(categories.get('research', []))
+        critical_count = categories['breaking'].total
+        research_count = categories['research'].total
         
         if critical_count > 0:
-            script += f"Notably, we saw {critical_count} major announcement{'s' if critical_count != 1 else ''} that could reshape the industry. "
+            out.write(f"Notably, we saw {critical_count} major announcement{plural(critical_count)} that could reshape the industry. ")
         
         if research_count > 0:
-            script += f"From the research front, {research_count} significant breakthrough{'s' if research_count != 1 else ''} emerged from leading institutions. "
+            out.write(f"From the research front, {research_count} significant breakthrough{plural(research_count)} emerged from leading institutions. ")
         
-        script += "Let's dive into the details.\n\n---\n\n"
+        out.write("Let's dive into the details.\n\n---\n\n")
         
         # Add detailed sections
-        section_order = ['breaking', 'research', 'industry', 'funding', 'tools', 'policy', 'trends', 'people']
-        section_titles = {
-            'breaking': '🚨 Breaking News & Major Announcements',
-            'research': '🔬 Research Breakthroughs & Academic Developments', 
-            'industry': '🏢 Industry News & Company Updates',
-            'funding': '💰 Investment & Funding News',
-            'tools': '🛠️ New Tools & Platforms',
-            'policy': '📋 Policy, Ethics & Regulation',
-            'trends': '📈 Market Trends & Analysis',
-            'people': '👥 Leadership & People News'
-        }
-        
-        for category in section_order:
-            articles = categories.get(category, [])
-            if not articles:
+        for category in SECTION_ORDER:
+            bucket = categories[category]
+            if not bucket.total:
                 continue
-                
-            script += f"## {section_titles[category]}\n\n"
+            
+            out.write(SECTION_HEADINGS[category])
             
             # Add section context
-            script += self._get_section_context(category, len(articles))
-            script += "\n\n"
+            out.write(self._get_section_context(category, bucket.total))
+            out.write("\n\n")
             
             # Add articles with rich context
-            for i, article in enumerate(articles[:8], 1):  # Limit to top 8 per section
-                script += self._format_article_for_script(article, i, category)
-                script += "\n"
+            for i, article in enumerate(bucket.items()[:8], 1):  # Limit to top 8 per section
+                if self.fragments is None:
+                    self._write_article_for_script(out, article, i, category)
+                else:
+                    out.write(self.fragments.render(
+                        lambda buffer: self._write_article_for_script(buffer, article, i, category),
+                        RENDER_VERSION, i, category, article.get('title', 'Untitled Article'),
+                        article.get('source', 'Unknown Source'), article.get('summary', ''),
+                        article.get('priority_level', 'Medium')
+                    ))
+                out.write("\n")
             
-            script += "---\n\n"
+            out.write("---\n\n")
         
         # Add conclusion and analysis
-        script += self._build_conclusion_section(categories, all_articles)
-        
-        return script
+        self._write_conclusion_section(out, categories, total_articles)
     
     def _get_section_context(self, category, count):
         """Get contextual introduction for each section"""
-        contexts = {
-            'breaking': f"This week brought {count} major announcement{'s' if count != 1 else ''} that are already making waves across the AI industry. These developments represent significant shifts in capabilities, market positioning, and technological advancement.",
-            
-            'research': f"The academic and research community published {count} notable development{'s' if count != 1 else ''} this week. These findings provide crucial insights into the future direction of AI technology and its underlying scientific foundations.",
-            
-            'industry': f"Corporate developments dominated headlines with {count} significant update{'s' if count != 1 else ''} from major tech companies. These moves signal important strategic shifts and competitive positioning in the AI landscape.",
-            
-            'funding': f"The investment landscape saw {count} noteworthy development{'s' if count != 1 else ''} this week, reflecting continued confidence in AI innovation and market potential.",
-            
-            'tools': f"Developers and practitioners gained access to {count} new tool{'s' if count != 1 else ''} and platform{'s' if count != 1 else ''} this week, expanding the practical applications of AI technology.",
-            
-            'policy': f"Regulatory and ethical considerations took center stage with {count} important development{'s' if count != 1 else ''} in AI governance and policy formation.",
-            
-            'trends': f"Market analysis revealed {count} significant trend{'s' if count != 1 else ''} shaping the broader AI ecosystem and its future trajectory.",
-            
-            'people': f"Leadership changes and key personnel moves made news with {count} important announcement{'s' if count != 1 else ''} across the industry."
-        }
-        
-        return contexts.get(category, f"This section covers {count} important development{'s' if count != 1 else ''} in {category}.")
+        template = SECTION_CONTEXTS.get(category, DEFAULT_SECTION_CONTEXT)
+        return template.render(count=count, s=plural(count), category=category)
     
-    def _format_article_for_script(self, article, index, category):
-        """Format individual articles with rich context for engaging discussion"""
-        
+    def _write_article_for_script(self, out, article, index, category):
         title = article.get('title', 'Untitled Article')
         source = article.get('source', 'Unknown Source')
         summary = article.get('summary', '')
         priority = article.get('priority_level', 'Medium')
         
         # Clean title and summary
-        clean_title = re.sub(r'^\d+\.\s*', '', title)  # Remove numbering
-        clean_title = re.sub(r'[🔥⭐]', '', clean_title)  # Remove emojis
+        clean_title = NUMBERING_RE.sub('', title)  # Remove numbering
+        clean_title = TITLE_EMOJI_RE.sub('', clean_title)  # Remove emojis
         
-        script_section = f"### {index}. {clean_title}\n\n"
+        out.write(f"### {index}. {clean_title}\n\n")
         
         # Add priority indicator and context
-        priority_context = {
-            'Critical': '**🚨 CRITICAL DEVELOPMENT**',
-            'High': '**⭐ HIGH IMPACT**',
-            'Medium': '**📢 NOTABLE**',
-            'Low': '**📋 UPDATE**'
-        }
-        
-        if priority in priority_context:
-            script_section += f"{priority_context[priority]}\n\n"
+        if priority in PRIORITY_CONTEXT:
+            out.write(PRIORITY_CONTEXT[priority])
         
         # Add source context
-        script_section += f"**Source:** {source}\n\n"
+        out.write(f"**Source:** {source}\n\n")
         
         # Add rich summary and discussion points
         if summary:
             # Clean summary
             clean_summary = summary.replace('Summary:', '').strip()
             if clean_summary:
-                script_section += f"**Key Details:** {clean_summary}\n\n"
+                out.write(f"**Key Details:** {clean_summary}\n\n")
         
         # Add discussion prompts based on category
         discussion_prompts = self._get_discussion_prompts(category, clean_title, summary)
         if discussion_prompts:
-            script_section += f"**Discussion Points:**\n{discussion_prompts}\n\n"
+            out.write(f"**Discussion Points:**\n{discussion_prompts}\n\n")
         
         # Add industry implications
         implications = self._get_implications(category, clean_title, priority)
         if implications:
-            script_section += f"**Industry Implications:** {implications}\n\n"
-        
-        return script_section
+            out.write(f"**Industry Implications:** {implications}\n\n")
     
     def _get_discussion_prompts(self, category, title, summary):
         """Generate relevant discussion prompts for NotebookLM hosts"""
-        
-        title_lower = title.lower()
-        summary_lower = (summary or '').lower()
-        
-        prompts = {
-            'breaking': [
-                "- What makes this announcement particularly significant for the AI industry?",
-                "- How might this impact existing market players and competitive dynamics?",
-                "- What are the potential implications for developers and end users?"
-            ],
-            'research': [
-                "- What new possibilities does this research unlock?",
-                "- How might this advance translate into practical applications?",
-                "- What are the broader scientific implications of these findings?"
-            ],
-            'industry': [
-                "- What strategic motivations might be driving this move?",
-                "- How does this fit into the company's broader AI strategy?",
-                "- What signal does this send to the market and competitors?"
-            ],
-            'funding': [
-                "- What does this investment say about market confidence in AI?",
-                "- How might this funding accelerate development in this space?",
-                "- What trends does this reflect in AI investment patterns?"
-            ]
-        }
-        
-        base_prompts = prompts.get(category, [
-            "- What are the key implications of this development?",
-            "- How might this impact the broader AI ecosystem?",
-            "- What should industry watchers pay attention to next?"
-        ])
-        
-        return '\n'.join(base_prompts)
+        return '\n'.join(DISCUSSION_PROMPTS.get(category, DEFAULT_DISCUSSION_PROMPTS))
     
     def _get_implications(self, category, title, priority):
         """Generate industry implications for discussion"""
-        
-        implications = {
-            'Critical': "This development has the potential to significantly reshape competitive dynamics and market positioning across the AI industry.",
-            'High': "This represents an important shift that industry participants should monitor closely for strategic implications.",
-            'Medium': "This development contributes to ongoing trends and may influence future industry direction.",
-            'Low': "While incremental, this update reflects broader patterns in AI industry evolution."
-        }
-        
-        return implications.get(priority, "This development adds to the evolving AI landscape and merits industry attention.")
+        return IMPLICATIONS.get(priority, DEFAULT_IMPLICATION)
     
-    def _build_conclusion_section(self, categories, all_articles):
-        """Build comprehensive conclusion with analysis and forward-looking insights"""
-        
-        conclusion = "## Weekly Analysis & Looking Ahead\n\n"
-        
-        conclusion += "### Key Takeaways\n\n"
+    def _write_conclusion_section(self, out, categories, total_articles):
+        out.write("## Weekly Analysis & Looking Ahead\n\n### Key Takeaways\n\n")
         
         # Synthesize major themes
-        if categories.get('breaking'):
-            conclusion += "**Major Announcements:** This week's breakthrough announcements signal accelerating innovation and intensifying competition in the AI space. The pace of development continues to exceed industry expectations.\n\n"
-        
-        if categories.get('research'):
-            conclusion += "**Research Progress:** Academic and research developments this week demonstrate continued advancement in AI capabilities and our understanding of these systems. These findings will likely influence practical applications in the coming months.\n\n"
-        
-        if categories.get('funding'):
-            conclusion += "**Investment Climate:** Funding activity reflects sustained investor confidence in AI innovation, with particular interest in practical applications and enterprise solutions.\n\n"
-        
-        if categories.get('policy'):
-            conclusion += "**Regulatory Environment:** Policy developments indicate growing attention to AI governance and ethical considerations, which will increasingly shape industry practices.\n\n"
-        
-        conclusion += "### Industry Implications\n\n"
-        conclusion += "The developments covered this week reflect several important trends:\n\n"
-        conclusion += "- **Acceleration:** The pace of AI innovation continues to accelerate across research, development, and deployment\n"
-        conclusion += "- **Democratization:** New tools and platforms are making AI capabilities more accessible to broader audiences\n"
-        conclusion += "- **Maturation:** The industry is showing signs of maturation with increased focus on practical applications and governance\n"
-        conclusion += "- **Competition:** Competitive dynamics are intensifying as major players vie for market position\n\n"
-        
-        conclusion += "### What to Watch Next Week\n\n"
-        conclusion += "Based on this week's developments, here are key areas to monitor:\n\n"
-        conclusion += "- Follow-up announcements and product releases from major AI companies\n"
-        conclusion += "- Market reactions and competitive responses to breakthrough developments\n"
-        conclusion += "- Academic publications building on this week's research findings\n"
-        conclusion += "- Policy responses to emerging AI capabilities and applications\n"
-        conclusion += "- Investment and funding activity in emerging AI sectors\n\n"
+        for category, takeaway in TAKEAWAYS:
+            if categories[category].total:
+                out.write(takeaway)
         
-        conclusion += "### Conclusion\n\n"
-        conclusion += f"This week's {len(all_articles)} developments underscore the dynamic nature of the AI industry. "
-        conclusion += "From breakthrough research to major corporate announcements, the pace of change continues to accelerate. "
-        conclusion += "As AI capabilities expand and mature, we're seeing increased focus on practical applications, "
-        conclusion += "ethical considerations, and competitive positioning.\n\n"
-        conclusion += "The industry remains in a period of rapid evolution, with each week bringing significant "
-        conclusion += "developments that shape the future of artificial intelligence and its impact on society.\n\n"
-        
-        return conclusion
+        out.write(CONCLUSION_BODY)
+        CONCLUSION_END.write(out, total=total_articles)
     
-    def _create_summary_document(self, articles, output_path):
+    def _create_summary_document(self, digest, output_path):
         """Create a concise summary document for NotebookLM context"""
-        
-        date_str = datetime.now().strftime('%B %d, %Y')
-        
-        summary = f"""AI Industry Weekly Summary - {date_str}
-
-OVERVIEW
-========
-This document summarizes {len(articles)} key developments in artificial intelligence from the past week.
-
-MAJOR DEVELOPMENTS
-==================
-"""
-        
-        # Sort by priority and add top stories
-        sorted_articles = sorted(articles, 
-                               key=lambda x: (x.get('relevance_score', 0), x.get('published', '')), 
-                               reverse=True)
-        
-        for i, article in enumerate(sorted_articles[:15], 1):  # Top 15 stories
-            summary += f"\n{i}. {article.get('title', 'Untitled')}\n"
-            summary += f"   Source: {article.get('source', 'Unknown')}\n"
-            if article.get('summary'):
-                clean_summary = article['summary'].replace('Summary:', '').strip()
-                summary += f"   Details: {clean_summary}\n"
-            if article.get('priority_level'):
-                summary += f"   Priority: {article['priority_level']}\n"
-        
-        # Add category breakdown
-        categories = self._categorize_articles(articles)
-        summary += f"\n\nCATEGORY BREAKDOWN\n==================\n"
-        
-        for category, cat_articles in categories.items():
-            if cat_articles:
-                summary += f"{category.title()}: {len(cat_articles)} stories\n"
-        
-        # Save summary
         with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(summary)
+            SUMMARY_DOCUMENT_HEADER.write(f, date=datetime.now().strftime('%B %d, %Y'), total=digest.total)
+            
+            # Add top stories, already ranked by priority in the digest
+            for i, article in enumerate(digest.top_stories.items()[:15], 1):  # Top 15 stories
+                f.write(f"\n{i}. {article.get('title', 'Untitled')}\n")
+                f.write(f"   Source: {article.get('source', 'Unknown')}\n")
+                if article.get('summary'):
+                    clean_summary = article['summary'].replace('Summary:', '').strip()
+                    f.write(f"   Details: {clean_summary}\n")
+                if article.get('priority_level'):
+                    f.write(f"   Priority: {article['priority_level']}\n")
+            
+            # Add category breakdown
+            f.write("\n\nCATEGORY BREAKDOWN\n==================\n")
+            
+            for category, bucket in digest.podcast_categories.items():
+                if bucket.total:
+                    f.write(f"{category.title()}: {bucket.total} stories\n")
         
         self.logger.info(f"✅ NotebookLM summary document saved to: {output_path}")
 
 # Integration function
-def create_notebooklm_assets(articles_data):
+def create_notebooklm_assets(articles_data, fragments=None):
     """Create both script and summary for NotebookLM"""
     
-    generator = NotebookLMScriptGenerator()
+    generator = NotebookLMScriptGenerator(fragments)
     
     print("📝 Creating NotebookLM-optimized assets...")
     
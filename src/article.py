@@ -0,0 +1,107 @@
+_MISSING = object()
+
+
+class Article:
+    """Compact article record that behaves like the dicts it replaces
+
+    Fields live in __slots__ instead of a per-article dict, and the
+    lowercased title and summary are computed once and cached, so the
+    filter, the classifier and the dedup pass never rebuild them. Articles
+    still read and write like dicts (article['title'], article.get(...),
+    'relevance_score' in article), and to_dict() returns the usual JSON
+    shape. Unset optional fields are absent, exactly like missing dict keys.
+    """
+    FIELDS = ('title', 'link', 'published', 'summary', 'source', 'priority',
+              'relevance_score', 'priority_level', 'summary_category',
+              'podcast_category', 'also_reported_by')
+
+    __slots__ = FIELDS + ('_title_lower', '_summary_lower', '_extra')
+
+    def __init__(self, title, link, published=None, summary='', source=None, priority=None, **fields):
+        self.title = title
+        self.link = link
+        self.published = published
+        self.summary = summary
+        self.source = source
+        self.priority = priority
+        self._title_lower = None
+        self._summary_lower = None
+        self._extra = None
+        for key, value in fields.items():
+            self[key] = value
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build an Article from a dict such as an archived JSON row"""
+        if isinstance(data, cls):
+            return data
+        return cls(**data)
+
+    @property
+    def title_lower(self):
+        if self._title_lower is None:
+            self._title_lower = self.title.lower()
+        return self._title_lower
+
+    @property
+    def summary_lower(self):
+        if self._summary_lower is None:
+            self._summary_lower = (self.summary or '').lower()
+        return self._summary_lower
+
+    def __getitem__(self, key):
+        if key in Article.FIELDS:
+            value = getattr(self, key, _MISSING)
+        else:
+            value = self._extra.get(key, _MISSING) if self._extra else _MISSING
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        if key in Article.FIELDS:
+            setattr(self, key, value)
+            if key == 'title':
+                self._title_lower = None
+            elif key == 'summary':
+                self._summary_lower = None
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        keys = [key for key in Article.FIELDS if hasattr(self, key)]
+        if self._extra:
+            keys += list(self._extra)
+        return keys
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def to_dict(self):
+        """Plain dict in the JSON shape the pipeline has always written"""
+        return dict(self.items())
+
+    def __repr__(self):
+        return f"Article({self.to_dict()!r})"
+
+
+def lowered_fields(article):
+    """(title, summary) lowercased; cached on Article, computed for plain dicts"""
+    if isinstance(article, Article):
+        return article.title_lower, article.summary_lower
+    return article['title'].lower(), (article.get('summary') or '').lower()
@@ -0,0 +1,342 @@
+import json
+import os
+import shlex
+import sqlite3
+from datetime import datetime
+import logging
+
+from links import canonical_url
+
+
+def _as_timestamp(value):
+    """Accept datetimes or ISO strings for date filters"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def match_query(text):
+    """Turn a search string into an FTS5 MATCH expression
+
+    Quoted parts are phrases, other words are single terms, and every part
+    must match: 'anthropic "ai safety"' becomes '"anthropic" AND "ai safety"'.
+    Everything is quoted, so FTS5 operators and punctuation in the input
+    (gpt-4, c++) are searched for instead of being parsed.
+    """
+    try:
+        parts = shlex.split(text)
+    except ValueError:      # unbalanced quote
+        parts = text.replace('"', ' ').split()
+    parts = [part.replace('"', '""') for part in parts if part.strip()]
+    if not parts:
+        raise ValueError("Empty search query")
+    return ' AND '.join(f'"{part}"' for part in parts)
+
+
+class ArticleStore:
+    """Persistent, indexed article archive backed by SQLite
+
+    Articles are upserted by canonical link, so reruns update rows instead of
+    duplicating them, and queries by date, source or score use indexes
+    instead of loading every dated JSON file. The full article dict is kept
+    alongside the indexed columns, so exports reproduce the JSON shape that
+    save_articles has always written.
+    """
+    # Version of the canonical_url rules archive keys were made with,
+    # kept in PRAGMA user_version; archives with older keys are re-keyed
+    LINK_VERSION = 1
+
+    # id aliases the rowid, so it is stable across VACUUM and the search
+    # index can point at it
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS articles (
+            id INTEGER PRIMARY KEY,
+            link TEXT NOT NULL UNIQUE,
+            title TEXT NOT NULL,
+            source TEXT,
+            published TEXT,
+            relevance_score INTEGER,
+            priority_level TEXT,
+            first_seen TEXT NOT NULL,
+            last_seen TEXT NOT NULL,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_articles_published ON articles(published);
+        CREATE INDEX IF NOT EXISTS idx_articles_source ON articles(source, published);
+        CREATE INDEX IF NOT EXISTS idx_articles_score ON articles(relevance_score, published);
+    """
+    # Full-text index over title, summary and source, keyed by articles.id
+    # and kept in sync by triggers, so every upsert updates it
+    SEARCH_SCHEMA = """
+        CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+            title, summary, source, tokenize = 'porter unicode61'
+        );
+        CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+            INSERT INTO articles_fts (rowid, title, summary, source)
+            VALUES (new.id, new.title, json_extract(new.data, '$.summary'), new.source);
+        END;
+        CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE ON articles BEGIN
+            DELETE FROM articles_fts WHERE rowid = old.id;
+            INSERT INTO articles_fts (rowid, title, summary, source)
+            VALUES (new.id, new.title, json_extract(new.data, '$.summary'), new.source);
+        END;
+        CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+            DELETE FROM articles_fts WHERE rowid = old.id;
+        END;
+    """
+    # Archives keyed by "link TEXT PRIMARY KEY" get the id column, taking
+    # the old rowids as ids; their search index is rebuilt all the same,
+    # since a VACUUM may already have renumbered those rows
+    UPGRADE_SCHEMA = """
+        BEGIN;
+        DROP TRIGGER IF EXISTS articles_fts_insert;
+        DROP TRIGGER IF EXISTS articles_fts_update;
+        DROP TRIGGER IF EXISTS articles_fts_delete;
+        DROP INDEX IF EXISTS idx_articles_published;
+        DROP INDEX IF EXISTS idx_articles_source;
+        DROP INDEX IF EXISTS idx_articles_score;
+        ALTER TABLE articles RENAME TO articles_old;
+        {schema}
+        INSERT INTO articles (id, link, title, source, published, relevance_score,
+                              priority_level, first_seen, last_seen, data)
+        SELECT rowid, link, title, source, published, relevance_score,
+               priority_level, first_seen, last_seen, data FROM articles_old;
+        DROP TABLE articles_old;
+        COMMIT;
+    """
+
+    def __init__(self, path="data/articles.db"):
+        self.path = path
+        self.logger = logging.getLogger(__name__)
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        upgraded = self._upgrade_schema()
+        self.conn.executescript(self.SCHEMA)
+        self.searchable = self._create_search_index(rebuild=upgraded)
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] < self.LINK_VERSION:
+            self._rekey_links()
+
+    def _rekey_links(self):
+        """Re-key every archived article with the current canonical_url
+
+        Rows whose links now share a key are merged: the most recently
+        seen row is kept, with the earliest first_seen of the group.
+        """
+        groups = {}
+        rows = self.conn.execute("SELECT link, first_seen FROM articles ORDER BY last_seen DESC")
+        for link, first_seen in rows.fetchall():
+            groups.setdefault(canonical_url(link), []).append((link, first_seen))
+
+        merged = 0
+        with self.conn:
+            for key, members in groups.items():
+                kept = members[0][0]
+                for link, _ in members[1:]:
+                    self.conn.execute("DELETE FROM articles WHERE link = ?", (link,))
+                    merged += 1
+                if kept != key or len(members) > 1:
+                    self.conn.execute(
+                        "UPDATE articles SET link = ?, first_seen = ? WHERE link = ?",
+                        (key, min(first_seen for _, first_seen in members), kept)
+                    )
+            self.conn.execute(f"PRAGMA user_version = {self.LINK_VERSION}")
+        if merged:
+            self.logger.info(f"Merged {merged} archived articles whose links now share a canonical URL")
+
+    def _upgrade_schema(self):
+        """Give archives made before the id column one; True if it was added"""
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(articles)")]
+        if not columns or 'id' in columns:
+            return False
+        self.conn.executescript(self.UPGRADE_SCHEMA.format(schema=self.SCHEMA))
+        self.logger.info(f"Added a stable id column to the archive {self.path}")
+        return True
+
+    def _create_search_index(self, rebuild=False):
+        """Create the full-text index, backfilling it for archives that predate it
+
+        rebuild re-indexes an existing index too, e.g. one an old-schema
+        archive may have left pointing at renumbered rows.
+        """
+        exists = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'articles_fts'"
+        ).fetchone()
+        try:
+            self.conn.executescript(self.SEARCH_SCHEMA)
+        except sqlite3.OperationalError as e:
+            self.logger.warning(f"Full-text search unavailable (SQLite without FTS5?): {e}")
+            return False
+        if rebuild or not exists:
+            self.rebuild_search_index()
+        return True
+
+    def rebuild_search_index(self):
+        """Re-index every archived article"""
+        with self.conn:
+            self.conn.execute("DELETE FROM articles_fts")
+            self.conn.execute("""
+                INSERT INTO articles_fts (rowid, title, summary, source)
+                SELECT id, title, json_extract(data, '$.summary'), source FROM articles
+            """)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def upsert_articles(self, articles):
+        """Insert new articles and refresh existing ones, keyed by canonical link"""
+        now = datetime.now().isoformat()
+        rows = [(
+            canonical_url(article['link']),
+            article['title'],
+            article.get('source'),
+            article.get('published'),
+            article.get('relevance_score'),
+            article.get('priority_level'),
+            now,
+            now,
+            json.dumps(dict(article.items()), default=str)
+        ) for article in articles]
+
+        with self.conn:
+            self.conn.executemany("""
+                INSERT INTO articles (link, title, source, published, relevance_score,
+                                      priority_level, first_seen, last_seen, data)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(link) DO UPDATE SET
+                    title = excluded.title,
+                    source = excluded.source,
+                    published = excluded.published,
+                    relevance_score = excluded.relevance_score,
+                    priority_level = excluded.priority_level,
+                    last_seen = excluded.last_seen,
+                    data = excluded.data
+            """, rows)
+
+        self.logger.info(f"Archived {len(rows)} articles in {self.path}")
+        return len(rows)
+
+    def contains(self, link):
+        """Return True if an article with this link is already archived"""
+        row = self.conn.execute(
+            "SELECT 1 FROM articles WHERE link = ?", (canonical_url(link),)
+        ).fetchone()
+        return row is not None
+
+    def get_many(self, links):
+        """Return archived articles for links, in the given order"""
+        keys = [canonical_url(link) for link in links]
+        found = {}
+        # Stay below SQLite's bound-parameter limit
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            placeholders = ','.join('?' * len(chunk))
+            for link, data in self.conn.execute(
+                f"SELECT link, data FROM articles WHERE link IN ({placeholders})", chunk
+            ):
+                found[link] = json.loads(data)
+        return [found[key] for key in keys if key in found]
+
+    def query(self, since=None, until=None, source=None, min_score=None, limit=None):
+        """Return archived articles ordered by relevance score and date"""
+        clauses = []
+        params = []
+        if since is not None:
+            clauses.append("published >= ?")
+            params.append(_as_timestamp(since))
+        if until is not None:
+            clauses.append("published < ?")
+            params.append(_as_timestamp(until))
+        if source is not None:
+            clauses.append("source = ?")
+            params.append(source)
+        if min_score is not None:
+            clauses.append("relevance_score >= ?")
+            params.append(min_score)
+
+        sql = "SELECT data FROM articles"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY relevance_score DESC, published DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        return [json.loads(data) for (data,) in self.conn.execute(sql, params)]
+
+    def search(self, text, since=None, until=None, source=None, limit=50, order='rank'):
+        """Return archived articles matching a search string (see match_query)
+
+        Results are ordered by BM25 relevance (title matches weigh most), or
+        newest first with order='date'. Date and source filters work as in
+        query().
+        """
+        if not self.searchable:
+            raise RuntimeError("This SQLite build has no FTS5; full-text search is unavailable")
+
+        clauses = ["articles_fts MATCH ?"]
+        params = [match_query(text)]
+        if since is not None:
+            clauses.append("a.published >= ?")
+            params.append(_as_timestamp(since))
+        if until is not None:
+            clauses.append("a.published < ?")
+            params.append(_as_timestamp(until))
+        if source is not None:
+            clauses.append("a.source = ?")
+            params.append(source)
+
+        sql = ("SELECT a.data FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid"
+               " WHERE " + " AND ".join(clauses))
+        if order == 'date':
+            sql += " ORDER BY a.published DESC"
+        else:
+            sql += " ORDER BY bm25(articles_fts, 5.0, 1.0, 2.0), a.published DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        return [json.loads(data) for (data,) in self.conn.execute(sql, params)]
+
+    def export_json(self, filename, links=None, **filters):
+        """Write archived articles to filename in the save_articles JSON shape
+
+        Exports the given links in order, or every article matching the
+        query() filters when no links are given.
+        """
+        articles = self.get_many(links) if links is not None else self.query(**filters)
+
+        with open(filename, 'w') as f:
+            json.dump(articles, f, indent=2, default=str)
+
+        self.logger.info(f"Exported {len(articles)} articles to {filename}")
+        return filename
+
+# Usage example
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Export archived articles to JSON")
+    parser.add_argument('output', help='JSON file to write')
+    parser.add_argument('--db', default='data/articles.db')
+    parser.add_argument('--since', help='ISO date, inclusive')
+    parser.add_argument('--until', help='ISO date, exclusive')
+    parser.add_argument('--source')
+    parser.add_argument('--min-score', type=int)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    with ArticleStore(args.db) as store:
+        store.export_json(args.output, since=args.since, until=args.until,
+                          source=args.source, min_score=args.min_score)
@@ -0,0 +1,77 @@
+from article import lowered_fields
+from keyword_matcher import KeywordMatcher
+
+# Text summary / Word document taxonomy. Rules are checked in order and the
+# first one with a keyword hit wins; Critical articles and unmatched
+# articles are handled in classify_hits.
+SUMMARY_CATEGORY_RULES = [
+    ('research', ['arxiv', 'research', 'paper', 'study', 'academic']),
+    ('policy', ['regulation', 'policy', 'law', 'ethics', 'governance', 'government']),
+    ('education', ['tutorial', 'guide', 'how-to', 'course', 'learning'])
+]
+
+# NotebookLM podcast taxonomy, same first-match-wins ordering
+PODCAST_CATEGORY_RULES = [
+    ('breaking', ['breaking', 'announces', 'launches', 'releases', 'unveils']),
+    ('research', ['arxiv', 'research', 'paper', 'study', 'academic', 'university']),
+    ('funding', ['funding', 'investment', 'raises', 'series', 'valuation', 'ipo']),
+    ('policy', ['regulation', 'policy', 'law', 'ethics', 'governance', 'government']),
+    ('trends', ['trend', 'market', 'analysis', 'forecast', 'prediction', 'outlook']),
+    ('tools', ['tool', 'app', 'platform', 'api', 'framework', 'library']),
+    ('people', ['ceo', 'cto', 'founder', 'hire', 'joins', 'interview', 'appoint'])
+]
+
+SUMMARY_CATEGORIES = ['critical', 'research', 'industry', 'policy', 'education']
+PODCAST_CATEGORIES = ['breaking', 'research', 'industry', 'policy', 'trends', 'tools', 'funding', 'people']
+
+
+class ArticleClassifier:
+    """Assign both category taxonomies to an article from a single keyword scan
+
+    The results are stored on the article as 'summary_category' (5-way, used
+    by AINewsSummarizer) and 'podcast_category' (8-way, used by the
+    NotebookLM generator) so renderers never re-scan the text.
+    """
+    # The rules are constants, so every instance shares one compiled matcher
+    _shared_matcher = None
+
+    def __init__(self):
+        self.groups = {}
+        for name, keywords in SUMMARY_CATEGORY_RULES:
+            self.groups[f'summary:{name}'] = keywords
+        for name, keywords in PODCAST_CATEGORY_RULES:
+            self.groups[f'podcast:{name}'] = keywords
+
+    def classify(self, article):
+        """Scan an article's text and attach both categories"""
+        if ArticleClassifier._shared_matcher is None:
+            ArticleClassifier._shared_matcher = KeywordMatcher(self.groups)
+        _, _, hits = ArticleClassifier._shared_matcher.scan_fields(*lowered_fields(article))
+        self.classify_hits(article, hits)
+        return article
+
+    def classify_hits(self, article, hits):
+        """Attach both categories from per-group hit counts of a shared scan"""
+        is_critical = article.get('priority_level') == 'Critical'
+
+        summary_category = 'industry'
+        if is_critical:
+            summary_category = 'critical'
+        else:
+            for name, _ in SUMMARY_CATEGORY_RULES:
+                if hits[f'summary:{name}']:
+                    summary_category = name
+                    break
+
+        podcast_category = 'industry'
+        if is_critical:
+            podcast_category = 'breaking'
+        else:
+            for name, _ in PODCAST_CATEGORY_RULES:
+                if hits[f'podcast:{name}']:
+                    podcast_category = name
+                    break
+
+        article['summary_category'] = summary_category
+        article['podcast_category'] = podcast_category
+        return article
@@ -1,84 +1,514 @@
-import feedparser
+import io
 import json
-import requests
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
+from urllib.parse import urlparse
+import threading
 import time
 import logging
 
+from article import Article, lowered_fields
+from article_store import ArticleStore
+from classifier import ArticleClassifier
+from config import load_config
+from dedup import NearDuplicateDetector
+from digest import TopK
+from feed_cache import FeedCache
+from feed_health import FeedHealth
+from feed_scanner import FeedScanner
+from html_text import HTMLTextCleaner
+from links import DEFAULT_RESOLVE_HOSTS, LinkCanonicalizer, RedirectCache
+from profiles import ProfileScorer
+from watermarks import FeedWatermarks
+from work_queue import WorkQueue, run_worker, work
+
+
+class HostThrottle:
+    """Enforce a minimum delay between requests to the same host"""
+    def __init__(self, delay=1.0):
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._next_slot = {}
+
+    def wait(self, url, deadline=None):
+        """Block until the host serving url may be contacted again
+        
+        Returns False without waiting or reserving a slot when the host's
+        next slot is after deadline (a time.time() value).
+        """
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            if deadline is not None and time.time() + (slot - now) > deadline:
+                return False
+            # Reserve the slot so other threads queue behind this request
+            self._next_slot[host] = slot + self.delay
+        if slot > now:
+            time.sleep(slot - now)
+        return True
+
+
 class AINewsCollector:
-    def __init__(self, config_path="config/sources.json"):
-        with open(config_path, 'r') as f:
-            self.config = json.load(f)
+    def __init__(self, config_path="config/sources.json", metrics=None, use_feed_cache=True):
+        # Parsed, validated and cached until sources.json changes
+        self.sources = load_config(config_path)
+        self.config = self.sources.data
         
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
+        
+        # Optional RunMetrics receiving one record per fetched feed
+        self.metrics = metrics
+        
+        # Conditional-GET cache; set "cache_path" to null to disable it. It holds
+        # every feed's entries in memory, so streaming runs go without it
+        cache_path = self.config.get('collection', {}).get('cache_path', 'data/feed_cache.json')
+        self.feed_cache = FeedCache(cache_path) if cache_path and use_feed_cache else None
+        
+        # Per-feed high-water marks for incremental runs
+        watermarks_path = self.config.get('collection', {}).get('watermarks_path', 'data/feed_watermarks.json')
+        self.watermarks = FeedWatermarks(watermarks_path) if watermarks_path else None
+        
+        # Circuit breaker skipping feeds that keep failing
+        collection = self.config.get('collection', {})
+        breaker = collection.get('circuit_breaker', {})
+        health_path = breaker.get('path', 'data/feed_health.json')
+        self.feed_health = FeedHealth(
+            health_path,
+            failure_threshold=breaker.get('failure_threshold', 3),
+            base_backoff=breaker.get('base_backoff', 8 * 86400),
+            max_backoff=breaker.get('max_backoff', 56 * 86400)
+        ) if health_path else None
+        
+        # Stop parsing date-ordered feeds once they run past the cutoff
+        self.feed_scanner = FeedScanner() if collection.get('early_stop', True) else None
+        
+        # Summary HTML reduced to plain text, cached by content hash
+        html_text = collection.get('html_text', {})
+        self.html_text = HTMLTextCleaner(
+            html_text.get('cache_path', 'data/html_text_cache.json'),
+            max_entries=html_text.get('max_entries', 50000)
+        ) if html_text.get('enabled', True) else None
+        
+        # Article links; redirector links are resolved once and cached
+        canonical = collection.get('canonical_urls', {})
+        redirect_path = canonical.get('redirect_cache_path', 'data/redirect_cache.json')
+        self.redirects = RedirectCache(
+            redirect_path,
+            max_entries=canonical.get('max_entries', 100000)
+        ) if redirect_path else None
+        self.link_canonicalizer = LinkCanonicalizer(
+            self.redirects,
+            resolve_hosts=canonical.get('resolve_hosts', DEFAULT_RESOLVE_HOSTS)
+        )
+        self.classifier = ArticleClassifier()
+        self._http_client = None
+        self._redirect_throttle = None
+        self._profile_scorer = None
+    
+    def collect_rss_feeds(self, days_back=7, concurrent=True, incremental=False):
+        """Collect articles from RSS feeds from the last N days
+
+        Feeds are fetched in parallel by a bounded thread pool unless
+        concurrent is False. Politeness is enforced per host, so feeds on
+        different servers never wait on each other. With incremental=True
+        only entries newer than each feed's watermark are returned; call
+        commit_watermarks() once they have been archived.
+        """
+        return list(self.iter_rss_feeds(days_back=days_back, concurrent=concurrent, incremental=incremental))
     
-    def collect_rss_feeds(self, days_back=7):
-        """Collect articles from RSS feeds from the last N days"""
-        all_articles = []
+    def iter_rss_feeds(self, days_back=7, concurrent=True, incremental=False):
+        """Yield articles from RSS feeds from the last N days, feed by feed
+
+        Only a bounded number of fetched feeds is held at a time, so memory
+        does not grow with the number of configured feeds.
+        """
+        count = 0
         cutoff_date = datetime.now() - timedelta(days=days_back)
+        feeds = self.config['rss_feeds']
+        
+        if incremental and not self.watermarks:
+            raise ValueError("Incremental collection needs collection.watermarks_path")
+        
+        deadline = self._run_deadline()
+        for articles in self._iter_feed_results(feeds, cutoff_date, concurrent, incremental, deadline):
+            count += len(articles)
+            yield from articles
         
-        for feed_config in self.config['rss_feeds']:
+        self._save_feed_state(feeds)
+        
+        self.logger.info(f"Collected {count} {'new ' if incremental else ''}articles")
+    
+    def poll_feeds(self, feeds, days_back=7):
+        """Fetch the given feeds once and return [(feed_config, articles)] in order
+        
+        Used by NewsDaemon, which polls each feed on its own schedule
+        instead of collecting every configured feed at once.
+        """
+        results = self.fetch_feeds(feeds, datetime.now() - timedelta(days=days_back))
+        self._save_feed_state()
+        return results
+    
+    def fetch_feeds(self, feeds, cutoff_date, deadline=None):
+        """Fetch feeds concurrently and return [(feed_config, articles)] in order
+        
+        Nothing is saved; the feed cache and feed health are only updated
+        in memory. Without a deadline, collection.run_timeout applies.
+        """
+        if deadline is None:
+            deadline = self._run_deadline()
+        return list(zip(feeds, self._iter_feed_results(feeds, cutoff_date, True, deadline=deadline)))
+    
+    def _run_deadline(self):
+        """time.time() by which a collection must finish, or None without run_timeout"""
+        run_timeout = self.config.get('collection', {}).get('run_timeout')
+        return time.time() + run_timeout if run_timeout else None
+    
+    def _save_feed_state(self, feeds=None):
+        """Persist the feed cache, feed health and HTML text cache
+        
+        The feed cache and feed health are pruned to feeds when given.
+        """
+        for name, state in (('feed cache', self.feed_cache), ('feed health', self.feed_health)):
+            if not state:
+                continue
+            if feeds is not None:
+                state.prune(feed['url'] for feed in feeds)
             try:
-                self.logger.info(f"Fetching from {feed_config['name']}")
-                feed = feedparser.parse(feed_config['url'])
-                
-                for entry in feed.entries:
-                    # Parse publish date
+                state.save()
+            except OSError as e:
+                self.logger.warning(f"Could not save {name}: {e}")
+        
+        if self.html_text:
+            try:
+                self.html_text.save()
+            except OSError as e:
+                self.logger.warning(f"Could not save HTML text cache: {e}")
+    
+    def collect_sharded(self, days_back=7, workers=None):
+        """Collect through the work queue with several worker processes
+        
+        The feeds are queued as host-grouped shards (see WorkQueue), fetched
+        by `workers` local processes, by this process and by any worker
+        started on another machine against the same queue file, and merged
+        back in config order. The result is the same list collect_rss_feeds
+        returns, whichever worker fetched which shard.
+        """
+        settings = self.config.get('sharding', {})
+        workers = settings.get('workers', 4) if workers is None else workers
+        queue_path = settings.get('queue_path', 'data/work_queue.db')
+        lease_seconds = settings.get('lease_seconds', 600)
+        max_attempts = settings.get('max_attempts', 3)
+        feeds = self.config['rss_feeds']
+        cutoff_date = datetime.now() - timedelta(days=days_back)
+        
+        with WorkQueue(queue_path, lease_seconds, max_attempts) as queue:
+            run_id = queue.create_run(feeds, cutoff_date, settings.get('shard_size', 25),
+                                      deadline=self._run_deadline())
+            
+            pool = ProcessPoolExecutor(max_workers=workers) if workers else None
+            try:
+                futures = [
+                    pool.submit(run_worker, queue_path, self.sources.path, None, run_id,
+                                False, lease_seconds, max_attempts)
+                    for _ in range(workers)
+                ]
+                # Work alongside the local workers until the queue is drained
+                work(queue, self, run_id=run_id)
+                for future in futures:
                     try:
-                        published = datetime(*entry.published_parsed[:6])
-                        if published < cutoff_date:
-                            continue
-                    except:
-                        # If date parsing fails, include the article
-                        published = datetime.now()
-                    
-                    article = {
-                        'title': entry.title,
-                        'link': entry.link,
-                        'published': published.isoformat(),
-                        'summary': getattr(entry, 'summary', ''),
-                        'source': feed_config['name'],
-                        'priority': feed_config['priority']
-                    }
-                    all_articles.append(article)
-                
-                # Be respectful - small delay between requests
-                time.sleep(1)
+                        future.result()
+                    except Exception as e:
+                        self.logger.error(f"Collection worker failed: {e}")
+                # Then wait for shards leased to workers elsewhere, taking
+                # over any whose lease runs out
+                work(queue, self, run_id=run_id, until_finished=True)
+            finally:
+                if pool:
+                    pool.shutdown()
+            
+            articles, records, updates, failed_feeds = queue.merge(run_id)
+            queue.delete_run(run_id)
+        
+        if self.metrics:
+            for record in records:
+                self.metrics.record_feed(record)
+        for feed_config in failed_feeds:
+            self.logger.error(f"Feed {feed_config['name']} was not collected: its shard failed")
+        
+        if self.feed_cache:
+            self.feed_cache.apply(updates['cache'])
+        if self.feed_health:
+            self.feed_health.apply(updates['health'])
+        if self.html_text:
+            self.html_text.apply(updates['html_text'])
+        self._save_feed_state(feeds)
+        
+        self.logger.info(f"Collected {len(articles)} articles from {len(feeds)} feeds in sharded mode")
+        return [Article.from_dict(article) for article in articles]
+    
+    def commit_watermarks(self):
+        """Persist feed watermarks advanced by an incremental collection"""
+        self.watermarks.prune(feed['url'] for feed in self.config['rss_feeds'])
+        self.watermarks.save()
+    
+    def _iter_feed_results(self, feeds, cutoff_date, concurrent, incremental=False, deadline=None):
+        """Yield each feed's article list in config order, giving up on feeds at deadline"""
+        settings = self.config.get('collection', {})
+        throttle = HostThrottle(settings.get('per_host_delay', 1.0))
+        
+        if not concurrent or len(feeds) < 2:
+            for feed_config in feeds:
+                yield self._fetch_feed(feed_config, cutoff_date, throttle, incremental, deadline)
+            return
+        
+        max_workers = max(1, min(settings.get('max_workers', 8), len(feeds)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Keep a bounded window of feeds in flight; results are consumed
+            # in config order regardless of finish order
+            pending = deque()
+            for feed_config in feeds:
+                pending.append(executor.submit(self._fetch_feed, feed_config, cutoff_date, throttle,
+                                               incremental, deadline))
+                if len(pending) >= 2 * max_workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+    
+    def _fetch_feed(self, feed_config, cutoff_date, throttle, incremental=False, deadline=None):
+        """Fetch a single feed and return its articles newer than cutoff_date
+        
+        The fetch gets collection.feed_timeout seconds, cut short by the run
+        deadline. Feeds whose circuit is open, or whose turn comes after the
+        deadline, are skipped without a request.
+        """
+        articles = []
+        url = feed_config['url']
+        record = {
+            'feed': feed_config['name'],
+            'url': url,
+            'status': None,
+            'fetch_seconds': None,
+            'bytes': 0,
+            'wire_bytes': 0,
+            'entries': 0,
+            'in_window': 0,
+            'parse_seconds': None,
+            'error': None,
+            'skipped': None
+        }
+        open_until = self.feed_health.open_until(url) if self.feed_health else None
+        if open_until:
+            until = datetime.fromtimestamp(open_until).isoformat(timespec='minutes')
+            record['error'] = f"circuit open until {until}"
+            record['skipped'] = 'circuit_open'
+            self.logger.info(f"Skipping {feed_config['name']}: failing repeatedly, next try after {until}")
+            if self.metrics:
+                self.metrics.record_feed(record)
+            return articles
+        
+        try:
+            etag, modified = self.feed_cache.validators(url, cutoff_date) if self.feed_cache else (None, None)
+            
+            # Be respectful - space out requests to the same host
+            if not throttle.wait(url, deadline):
+                record['error'] = "run deadline reached before the feed's turn"
+                record['skipped'] = 'run_deadline'
+                self.logger.warning(f"Skipping {feed_config['name']}: run deadline reached")
+                if self.metrics:
+                    self.metrics.record_feed(record)
+                return articles
+            
+            feed_timeout = self.config.get('collection', {}).get('feed_timeout', 60)
+            feed_deadline = time.time() + feed_timeout
+            if deadline is not None:
+                feed_deadline = min(feed_deadline, deadline)
+            
+            self.logger.info(f"Fetching from {feed_config['name']}")
+            started = time.perf_counter()
+            response = self._get_http_client().get(url, etag, modified, feed_deadline)
+            record['fetch_seconds'] = round(time.perf_counter() - started, 6)
+            record['status'] = response.status_code
+            record['bytes'] = len(response.content)
+            record['wire_bytes'] = response.wire_bytes
+            
+            cached = self.feed_cache.get(url) if self.feed_cache else None
+            if response.status_code == 304 and cached and (etag or modified):
+                self.logger.info(f"{feed_config['name']} not modified, using cached entries")
+                entries = cached['entries']
+            else:
+                started = time.perf_counter()
+                entries, truncated = self._parse_feed(response, cutoff_date)
+                record['parse_seconds'] = round(time.perf_counter() - started, 6)
                 
-            except Exception as e:
-                self.logger.error(f"Error fetching {feed_config['name']}: {e}")
+                new_etag = response.headers.get('ETag')
+                new_modified = response.headers.get('Last-Modified')
+                if self.feed_cache and (new_etag or new_modified):
+                    # Truncated entries are only valid for runs looking back no further
+                    self.feed_cache.update(url, new_etag, new_modified, entries,
+                                           cutoff_date if truncated else None)
+            
+            record['entries'] = len(entries)
+            
+            if incremental:
+                entries = self.watermarks.new_entries(url, entries)
+            
+            articles = self._entries_to_articles(entries, feed_config, cutoff_date)
+            record['in_window'] = len(articles)
+            if self.feed_health:
+                self.feed_health.record_success(url)
+            
+        except Exception as e:
+            self.logger.error(f"Error fetching {feed_config['name']}: {e}")
+            record['error'] = str(e)
+            # A fetch cut short by the run deadline says nothing about the feed
+            if self.feed_health and not (deadline is not None and time.time() >= deadline):
+                self.feed_health.record_failure(url, e)
+        
+        if self.metrics:
+            self.metrics.record_feed(record)
+        
+        return articles
+    
+    def _get_http_client(self):
+        """Keep-alive connection pool shared by all fetch threads, created on first fetch"""
+        if self._http_client is None:
+            # Imported here so commands that never fetch skip loading requests
+            from http_client import FeedHTTPClient
+            
+            collection = self.config.get('collection', {})
+            self._http_client = FeedHTTPClient(
+                pool_size=collection.get('max_workers', 8),
+                max_bytes=collection.get('max_feed_bytes', 20 * 1024 * 1024),
+                connect_timeout=collection.get('connect_timeout', 10),
+                read_timeout=collection.get('read_timeout', 30)
+            )
+        return self._http_client
+    
+    def _parse_feed(self, response, cutoff_date=None):
+        """Parse a downloaded feed body into (entry dicts, truncated)
+        
+        With a cutoff, entries past the point where a date-ordered feed goes
+        stale are never parsed (see FeedScanner); truncated tells whether
+        the body was cut short.
+        """
+        content = response.content
+        if self.feed_scanner and cutoff_date:
+            content = self.feed_scanner.truncate(content, cutoff_date)
+        truncated = content is not response.content
         
-        self.logger.info(f"Collected {len(all_articles)} articles")
-        return all_articles
+        import feedparser
+        
+        response_headers = {key.lower(): value for key, value in response.headers.items()}
+        # Lets feedparser resolve relative links against the final URL
+        response_headers.setdefault('content-location', response.url)
+        feed = feedparser.parse(io.BytesIO(content), response_headers=response_headers)
+        return [self._entry_to_dict(entry) for entry in feed.entries], truncated
+    
+    def _entry_to_dict(self, entry):
+        """Reduce a parsed feed entry to the cacheable fields we use"""
+        # Parse publish date
+        try:
+            published = datetime(*entry.published_parsed[:6]).isoformat()
+        except:
+            published = None
+        
+        return {
+            'id': entry.get('id') or entry.link,
+            'title': entry.title,
+            'link': entry.link,
+            'published': published,
+            'summary': getattr(entry, 'summary', '')
+        }
     
-    def filter_relevant_articles(self, articles):
-        """Enhanced filtering with priority scoring and categories"""
-        keywords = [kw.lower() for kw in self.config['keywords']]
-        high_priority_kw = [kw.lower() for kw in self.config.get('advanced_filters', {}).get('high_priority_keywords', [])]
-        company_kw = [kw.lower() for kw in self.config.get('advanced_filters', {}).get('company_keywords', [])]
-        exclude_kw = [kw.lower() for kw in self.config.get('advanced_filters', {}).get('exclude_keywords', [])]
+    def _entries_to_articles(self, entries, feed_config, cutoff_date):
+        """Build articles from entry dicts, dropping those older than cutoff_date
+        
+        Summaries are converted from HTML to plain text and links stripped
+        of tracking parameters here, so entries from the feed cache (which
+        keeps them as served) are cleaned too. Redirector links already in
+        the redirect cache get their target; the others are only followed
+        for relevant articles (see _resolve_link).
+        """
+        clean = self.html_text.clean if self.html_text else None
+        articles = []
+        for entry in entries:
+            if entry['published']:
+                published = datetime.fromisoformat(entry['published'])
+                if published < cutoff_date:
+                    continue
+            else:
+                # If date parsing fails, include the article
+                published = datetime.now()
+            
+            article = Article(
+                title=entry['title'],
+                link=self.link_canonicalizer.article_link(entry['link']),
+                published=published.isoformat(),
+                summary=clean(entry['summary']) if clean else entry['summary'],
+                source=feed_config['name'],
+                priority=feed_config['priority']
+            )
+            articles.append(article)
+        
+        return articles
+    
+    def _get_keyword_matcher(self):
+        """Keyword automaton for filtering and classifying, compiled once per config
+        
+        The category rules are compiled in too, so the scan that scores an
+        article also classifies it.
+        """
+        return self.sources.matcher(self.classifier.groups)
+    
+    def filter_relevant_articles(self, articles, limit=None):
+        """Enhanced filtering with priority scoring and categories
+        
+        With a limit, only the best `limit` articles are kept, selected with a
+        bounded heap instead of sorting every relevant article.
+        """
+        relevant = self.iter_relevant_articles(articles)
+        
+        if limit is not None:
+            top = TopK(limit).extend(relevant)
+            self.logger.info(f"Filtered to {top.total} relevant articles, keeping the top {limit}")
+            return top.items()
         
-        filtered_articles = []
+        filtered_articles = list(relevant)
+        
+        # Sort by relevance score and date
+        filtered_articles.sort(
+            key=lambda x: (x['relevance_score'], x['published']), 
+            reverse=True
+        )
+        
+        self.logger.info(f"Filtered to {len(filtered_articles)} relevant articles")
+        return filtered_articles
+    
+    def iter_relevant_articles(self, articles):
+        """Score, classify and yield relevant articles as they arrive, unsorted"""
+        matcher = self._get_keyword_matcher()
         
         for article in articles:
-            title_lower = article['title'].lower()
-            summary_lower = article['summary'].lower()
-            combined_text = title_lower + ' ' + summary_lower
+            # One pass finds every keyword group in title, summary and both
+            title_hits, summary_hits, combined_hits = matcher.scan_fields(*lowered_fields(article))
             
             # Skip if contains excluded keywords
-            if any(excl in combined_text for excl in exclude_kw):
+            if combined_hits['exclude']:
                 continue
             
             # Calculate relevance score
-            title_score = sum(3 for kw in keywords if kw in title_lower)  # Title matches worth more
-            summary_score = sum(1 for kw in keywords if kw in summary_lower)
+            title_score = 3 * title_hits['keywords']  # Title matches worth more
+            summary_score = summary_hits['keywords']
             
             # Bonus points for high-priority keywords
-            priority_bonus = sum(2 for kw in high_priority_kw if kw in combined_text)
+            priority_bonus = 2 * combined_hits['high_priority']
             
             # Bonus for major companies
-            company_bonus = sum(2 for kw in company_kw if kw in combined_text)
+            company_bonus = 2 * combined_hits['company']
             
             # Source priority bonus
             source_bonus = 0
@@ -93,16 +523,87 @@ class AINewsCollector:
             if total_score >= 2 or article.get('priority') == 'high':
                 article['relevance_score'] = total_score
                 article['priority_level'] = self._determine_priority_level(total_score)
-                filtered_articles.append(article)
+                self.classifier.classify_hits(article, combined_hits)
+                article['link'] = self._resolve_link(article['link'])
+                yield article
         
-        # Sort by relevance score and date
-        filtered_articles.sort(
-            key=lambda x: (x['relevance_score'], x['published']), 
-            reverse=True
-        )
+        self._save_redirects()
+    
+    def _resolve_link(self, link):
+        """Follow link if it is a redirect not resolved yet, see LinkCanonicalizer
         
-        self.logger.info(f"Filtered to {len(filtered_articles)} relevant articles")
-        return filtered_articles
+        Only relevant articles get here, so few requests are made, and they
+        are bounded by the HTTP timeouts rather than a feed deadline: an
+        article whose redirect was left unresolved would change identity
+        (canonical_url of its link) once a later run resolves it.
+        """
+        if not self.link_canonicalizer.needs_resolving(link):
+            return link
+        if self._redirect_throttle is None:
+            delay = self.config.get('collection', {}).get('per_host_delay', 1.0)
+            self._redirect_throttle = HostThrottle(delay)
+        
+        def resolve(url):
+            # Redirectors get the same politeness as feeds
+            self._redirect_throttle.wait(url)
+            return self._get_http_client().resolve(url)
+        
+        return self.link_canonicalizer.article_link(link, resolve)
+    
+    def _save_redirects(self):
+        if self.redirects:
+            try:
+                self.redirects.save()
+            except OSError as e:
+                self.logger.warning(f"Could not save redirect cache: {e}")
+    
+    def rank_profiles(self, articles, limit=None):
+        """Score articles against every configured profile in one pass
+        
+        Returns {profile name: relevant articles, best first}; each profile
+        gets its own article copies, scored exactly as
+        filter_relevant_articles would with that profile's keywords.
+        """
+        if not self.sources.profiles:
+            raise ValueError("No scoring profiles configured in sources.json")
+        if self._profile_scorer is None:
+            self._profile_scorer = ProfileScorer(self.sources.profiles, self.classifier)
+        
+        ranked = self._profile_scorer.rank(articles, self._determine_priority_level, limit=limit)
+        for name, profile_articles in ranked.items():
+            for article in profile_articles:
+                article['link'] = self._resolve_link(article['link'])
+            self.logger.info(f"Profile {name}: {len(profile_articles)} relevant articles")
+        self._save_redirects()
+        return ranked
+    
+    def save_profile_articles(self, ranked, date=None):
+        """Write each profile's articles to data/articles_<profile>_<date>.json
+        
+        Profile scores differ from the default ones, so these files are
+        written directly instead of going through the archive.
+        """
+        date = date or datetime.now().strftime('%Y%m%d')
+        filenames = {}
+        for name, articles in ranked.items():
+            filename = f"data/articles_{re.sub(r'[^A-Za-z0-9_-]+', '_', name)}_{date}.json"
+            with open(filename, 'w') as f:
+                json.dump([article.to_dict() for article in articles], f, indent=2, default=str)
+            filenames[name] = filename
+        
+        self.logger.info(f"Saved articles for {len(filenames)} profiles")
+        return filenames
+    
+    def collapse_duplicates(self, articles):
+        """Merge near-duplicate stories from different sources into one article"""
+        settings = self.config.get('dedup', {})
+        if not settings.get('enabled', True):
+            return articles
+        
+        unique_articles = NearDuplicateDetector.from_config(self.config).collapse(articles)
+        
+        self.logger.info(f"Collapsed {len(articles) - len(unique_articles)} near-duplicate articles")
+        return unique_articles
     
     def _determine_priority_level(self, score):
         """Determine article priority based on relevance score"""
@@ -115,13 +616,59 @@ class AINewsCollector:
         else:
             return "Low"
     
+    def archive_articles(self, articles, batch_size=500):
+        """Upsert a stream of articles into the archive in batches, yielding each one"""
+        db_path = self.config.get('archive', {}).get('db_path', 'data/articles.db')
+        with ArticleStore(db_path) as store:
+            batch = []
+            for article in articles:
+                batch.append(article)
+                yield article
+                if len(batch) >= batch_size:
+                    store.upsert_articles(batch)
+                    batch = []
+            if batch:
+                store.upsert_articles(batch)
+    
+    def merge_with_archive(self, articles, days_back=7):
+        """Archive new articles and return the whole stored window, best first"""
+        cutoff_date = datetime.now() - timedelta(days=days_back)
+        
+        db_path = self.config.get('archive', {}).get('db_path', 'data/articles.db')
+        with ArticleStore(db_path) as store:
+            if articles:
+                store.upsert_articles(articles)
+            window = [Article.from_dict(row) for row in store.query(since=cutoff_date)]
+        
+        self.logger.info(f"Merged {len(articles)} new articles into a window of {len(window)}")
+        return window
+    
+    def export_articles(self, filename=None, **filters):
+        """Export archived articles (by links or ArticleStore.query filters) to JSON"""
+        if filename is None:
+            filename = f"data/articles_{datetime.now().strftime('%Y%m%d')}.json"
+        
+        db_path = self.config.get('archive', {}).get('db_path', 'data/articles.db')
+        with ArticleStore(db_path) as store:
+            store.export_json(filename, **filters)
+        
+        self.logger.info(f"Saved articles to {filename}")
+        return filename
+    
     def save_articles(self, articles, filename=None):
-        """Save articles to JSON file"""
+        """Archive articles and export this run's JSON file
+
+        Articles are upserted into the SQLite archive (see ArticleStore), so
+        same-day reruns refresh rows instead of losing history. The dated
+        JSON file is exported from the archive in the usual shape.
+        """
         if filename is None:
             filename = f"data/articles_{datetime.now().strftime('%Y%m%d')}.json"
         
-        with open(filename, 'w') as f:
-            json.dump(articles, f, indent=2, default=str)
+        db_path = self.config.get('archive', {}).get('db_path', 'data/articles.db')
+        with ArticleStore(db_path) as store:
+            store.upsert_articles(articles)
+            store.export_json(filename, links=[article['link'] for article in articles])
         
         self.logger.info(f"Saved articles to {filename}")
         return filename
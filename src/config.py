@@ -0,0 +1,97 @@
+import json
+import os
+
+from keyword_matcher import KeywordMatcher
+
+DEFAULT_CONFIG_PATH = "config/sources.json"
+FEED_PRIORITIES = ('high', 'medium', 'low')
+# Keyword group -> key of its list in a scoring profile
+PROFILE_KEYS = {
+    'keywords': 'keywords',
+    'high_priority': 'high_priority_keywords',
+    'company': 'company_keywords',
+    'exclude': 'exclude_keywords'
+}
+
+_cache = {}     # absolute path -> ((mtime_ns, size), SourcesConfig)
+
+
+class SourcesConfig:
+    """sources.json parsed, validated and with its keyword lists compiled
+
+    data is the parsed JSON; it is shared by every collector using the same
+    file, so treat it as read-only. The filter keyword groups are
+    lowercased once here and compiled into a KeywordMatcher on first use,
+    instead of on every AINewsCollector construction.
+    """
+    def __init__(self, data, path=None):
+        self.path = path
+        self.data = data
+        self.validate()
+
+        advanced = data.get('advanced_filters', {})
+        self.keyword_groups = {
+            'keywords': [kw.lower() for kw in data['keywords']],
+            'high_priority': [kw.lower() for kw in advanced.get('high_priority_keywords', [])],
+            'company': [kw.lower() for kw in advanced.get('company_keywords', [])],
+            'exclude': [kw.lower() for kw in advanced.get('exclude_keywords', [])]
+        }
+        # Scoring profiles; a group a profile leaves out is the default one
+        self.profiles = {
+            name: {
+                group: [kw.lower() for kw in profile[key]] if key in profile else self.keyword_groups[group]
+                for group, key in PROFILE_KEYS.items()
+            }
+            for name, profile in data.get('profiles', {}).items()
+        }
+        self._matchers = {}
+
+    def validate(self):
+        """Raise ValueError describing the first problem found"""
+        where = self.path or 'sources config'
+        feeds = self.data.get('rss_feeds')
+        if not isinstance(feeds, list):
+            raise ValueError(f"{where}: 'rss_feeds' must be a list")
+        for index, feed in enumerate(feeds):
+            missing = [key for key in ('name', 'url', 'priority') if key not in feed]
+            if missing:
+                raise ValueError(f"{where}: rss_feeds[{index}] is missing {', '.join(missing)}")
+            if feed['priority'] not in FEED_PRIORITIES:
+                raise ValueError(f"{where}: rss_feeds[{index}] has unknown priority {feed['priority']!r}")
+
+        keywords = self.data.get('keywords')
+        if not isinstance(keywords, list) or not all(isinstance(kw, str) for kw in keywords):
+            raise ValueError(f"{where}: 'keywords' must be a list of strings")
+
+        profiles = self.data.get('profiles', {})
+        if not isinstance(profiles, dict):
+            raise ValueError(f"{where}: 'profiles' must map profile names to keyword lists")
+        for name, profile in profiles.items():
+            for key in PROFILE_KEYS.values():
+                value = profile.get(key, []) if isinstance(profile, dict) else None
+                if not isinstance(value, list) or not all(isinstance(kw, str) for kw in value):
+                    raise ValueError(f"{where}: profiles[{name!r}] {key} must be a list of strings")
+
+    def matcher(self, extra_groups=None):
+        """KeywordMatcher over the filter groups plus extra_groups, compiled once"""
+        extra_groups = extra_groups or {}
+        key = tuple(sorted(extra_groups))
+        if key not in self._matchers:
+            self._matchers[key] = KeywordMatcher({**self.keyword_groups, **extra_groups})
+        return self._matchers[key]
+
+
+def load_config(path=DEFAULT_CONFIG_PATH):
+    """Return the SourcesConfig for path, re-reading it only after the file changes"""
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    key = os.path.abspath(path)
+
+    cached = _cache.get(key)
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    with open(path, 'r') as f:
+        config = SourcesConfig(json.load(f), path)
+    _cache[key] = (signature, config)
+    return config
@@ -0,0 +1,233 @@
+import heapq
+import logging
+import signal
+import threading
+import time
+from datetime import datetime, timedelta
+
+from links import canonical_url
+from digest import ArticleDigest, article_rank
+
+
+class PollScheduler:
+    """Adaptive per-feed polling intervals learned from entry timestamps
+
+    For every feed we remember when each entry inside the look-back window
+    was published (undated entries count from when they were first seen).
+    The mean gap between the most recent `samples` entries is the feed's
+    publishing interval, and the feed is polled twice per interval, clamped
+    to [min_interval, max_interval] seconds. Busy news sites therefore get
+    polled every few minutes and quiet blogs a few times a day.
+    """
+    def __init__(self, min_interval=600, max_interval=6 * 3600, samples=20):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.samples = samples
+        self.intervals = {}
+        self._seen = {}         # url -> {link: published datetime}
+        self._heap = []         # (due time, url)
+
+    def add(self, url, due=None):
+        """Schedule a feed, polled immediately unless due is given"""
+        self.intervals.setdefault(url, self.min_interval)
+        self._seen.setdefault(url, {})
+        heapq.heappush(self._heap, (due if due is not None else time.time(), url))
+
+    def next_due(self):
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now=None):
+        """Remove and return every feed URL whose poll is due"""
+        now = time.time() if now is None else now
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            due.append(heapq.heappop(self._heap)[1])
+        return due
+
+    def observe(self, url, articles, cutoff_date, now=None):
+        """Learn from a poll's in-window articles and schedule the next poll
+
+        Returns the articles this feed had not shown before.
+        """
+        now = time.time() if now is None else now
+        seen = self._seen[url]
+        first_seen = datetime.now()
+        fresh = []
+        for article in articles:
+            if article['link'] not in seen:
+                published = datetime.fromisoformat(article['published'])
+                seen[article['link']] = min(published, first_seen)
+                fresh.append(article)
+        for link in [link for link, published in seen.items() if published < cutoff_date]:
+            del seen[link]
+
+        interval = self.max_interval
+        recent = sorted(seen.values(), reverse=True)[:self.samples]
+        if recent:
+            span = (datetime.now() - recent[-1]).total_seconds()
+            interval = min(self.max_interval, max(self.min_interval, span / len(recent) / 2))
+        self.intervals[url] = interval
+        heapq.heappush(self._heap, (now + interval, url))
+        return fresh
+
+
+class RollingWindow:
+    """Relevant articles of the last days_back days, keyed by canonical link"""
+    def __init__(self, days_back=7):
+        self.days_back = days_back
+        self._articles = {}
+
+    def __len__(self):
+        return len(self._articles)
+
+    def add(self, articles):
+        """Add articles not seen before and return them"""
+        new = []
+        for article in articles:
+            key = canonical_url(article['link'])
+            if key not in self._articles:
+                self._articles[key] = article
+                new.append(article)
+        return new
+
+    def evict(self):
+        """Drop articles that fell out of the window"""
+        cutoff = (datetime.now() - timedelta(days=self.days_back)).isoformat()
+        for key in [key for key, article in self._articles.items() if article['published'] < cutoff]:
+            del self._articles[key]
+
+    def articles(self):
+        self.evict()
+        return list(self._articles.values())
+
+
+class NewsDaemon:
+    """Continuous collection around AINewsCollector
+
+    Each feed is polled on its own adaptive schedule (see PollScheduler),
+    new relevant articles are archived and kept in a RollingWindow, and a
+    digest of the window is built on demand: every render_interval seconds
+    when new articles arrived, or immediately on SIGUSR1. SIGINT and
+    SIGTERM stop the loop after the current poll.
+    """
+    def __init__(self, collector, days_back=7, render=None, render_interval=3600,
+                 min_poll_interval=600, max_poll_interval=6 * 3600):
+        self.collector = collector
+        self.days_back = days_back
+        self.render = render
+        self.render_interval = render_interval
+        self.logger = logging.getLogger(__name__)
+
+        self.scheduler = PollScheduler(min_poll_interval, max_poll_interval)
+        self.window = RollingWindow(days_back)
+        self.feeds = {feed['url']: feed for feed in collector.config['rss_feeds']}
+        if not self.feeds:
+            raise ValueError("No rss_feeds configured")
+        for url in self.feeds:
+            self.scheduler.add(url)
+
+        self.polls = 0
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._digest_requested = threading.Event()
+        self._dirty = False
+        self._unarchived = []
+        self._last_render = 0.0     # the first digest follows the first round of polls
+
+    def stop(self, *args):
+        """Stop the loop after the current poll (also the SIGINT/SIGTERM handler)"""
+        self._stop.set()
+        self._wake.set()
+
+    def request_digest(self, *args):
+        """Render a digest as soon as possible (also the SIGUSR1 handler)"""
+        self._digest_requested.set()
+        self._wake.set()
+
+    def poll_due(self):
+        """Poll every due feed once; returns the number of new relevant articles
+
+        A failing round (e.g. a locked archive database) is logged and its
+        feeds not yet rescheduled are retried after min_poll_interval, so
+        one transient error neither stops the daemon nor drops feeds.
+        Articles that could not be archived are archived with the next round.
+        """
+        due = self.scheduler.pop_due()
+        if not due:
+            return 0
+
+        observed = set()
+        try:
+            cutoff_date = datetime.now() - timedelta(days=self.days_back)
+            results = self.collector.poll_feeds([self.feeds[url] for url in due], days_back=self.days_back)
+            self.polls += len(results)
+
+            new_articles = []
+            for feed_config, articles in results:
+                # Only entries this feed has not shown before are scored
+                fresh = self.scheduler.observe(feed_config['url'], articles, cutoff_date)
+                observed.add(feed_config['url'])
+                new_articles += self.window.add(self.collector.iter_relevant_articles(fresh))
+
+            # Kept until archived, so a failed write is retried next round
+            self._unarchived += new_articles
+            if new_articles:
+                self._dirty = True
+            if self._unarchived:
+                list(self.collector.archive_articles(self._unarchived))
+                self._unarchived = []
+        except Exception as e:
+            retry_at = time.time() + self.scheduler.min_interval
+            for url in due:
+                if url not in observed:
+                    self.scheduler.add(url, due=retry_at)
+            self.logger.error(f"Poll round of {len(due)} feeds failed, retrying in "
+                              f"{self.scheduler.min_interval}s: {e}")
+            return 0
+        self.logger.info(f"Polled {len(results)} feeds, {len(new_articles)} new relevant articles, "
+                         f"{len(self.window)} in window")
+        return len(new_articles)
+
+    def digest(self):
+        """ArticleDigest of the current window, best first and de-duplicated"""
+        articles = sorted(self.window.articles(), key=article_rank, reverse=True)
+        articles = self.collector.collapse_duplicates(articles)
+        return ArticleDigest.from_articles(articles, self.collector.classifier)
+
+    def _render(self):
+        self._digest_requested.clear()
+        self._dirty = False
+        self._last_render = time.time()
+        digest = self.digest()
+        if not digest.total:
+            self.logger.warning("No relevant articles in the window, nothing to render")
+            return
+        if self.render:
+            try:
+                self.render(digest)
+            except Exception as e:
+                self.logger.error(f"Rendering the digest failed: {e}")
+
+    def run(self):
+        """Poll and render until stopped"""
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGINT, self.stop)
+            signal.signal(signal.SIGTERM, self.stop)
+            if hasattr(signal, 'SIGUSR1'):
+                signal.signal(signal.SIGUSR1, self.request_digest)
+
+        self.logger.info(f"Daemon watching {len(self.feeds)} feeds")
+        while not self._stop.is_set():
+            self._wake.clear()
+            self.poll_due()
+
+            render_due = self._dirty and time.time() - self._last_render >= self.render_interval
+            if self._digest_requested.is_set() or render_due:
+                self._render()
+
+            wake_at = self.scheduler.next_due()
+            if self._dirty:
+                wake_at = min(wake_at, self._last_render + self.render_interval)
+            self._wake.wait(max(0.0, wake_at - time.time()))
+
+        self.logger.info(f"Daemon stopped after {self.polls} feed polls")
@@ -0,0 +1,149 @@
+import re
+import zlib
+from collections import defaultdict
+
+from article import lowered_fields
+
+SOURCE_PRIORITY_RANK = {'high': 0, 'medium': 1, 'low': 2}
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the "
+    "this to was were will with".split()
+)
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+_EMPTY_BIN = 1 << 32
+
+
+class NearDuplicateDetector:
+    """Collapse near-duplicate stories reported by several sources
+
+    Each article's title and leading summary words are reduced to word
+    shingles and a MinHash signature (one-permutation hashing: every shingle
+    hash lands in one of num_bins bins, each bin keeps its minimum; empty
+    bins are filled from their neighbours). LSH banding buckets the
+    signatures, so only articles sharing a band are ever compared, and each
+    candidate pair is confirmed with the exact Jaccard similarity of the
+    shingle sets. Cost is roughly linear in the number of articles instead
+    of quadratic, for short title-only articles too.
+    """
+    def __init__(self, threshold=0.5, shingle_size=2, summary_words=60, num_bins=24, bands=8):
+        if num_bins % bands:
+            raise ValueError("num_bins must be a multiple of bands")
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.summary_words = summary_words
+        self.num_bins = num_bins
+        self.bands = bands
+        self.rows = num_bins // bands
+
+    @classmethod
+    def from_config(cls, config):
+        """Build a detector from the 'dedup' section of sources.json"""
+        settings = dict(config.get('dedup', {}))
+        settings.pop('enabled', None)
+        return cls(**settings)
+
+    def shingles(self, article):
+        """Return the set of hashed word shingles for an article"""
+        title, summary = lowered_fields(article)
+        words = [w for w in _TOKEN_RE.findall(title) if w not in STOPWORDS]
+        summary = _TOKEN_RE.findall(summary)
+        words += [w for w in summary if w not in STOPWORDS][:self.summary_words]
+
+        size = self.shingle_size
+        if len(words) < size:
+            return {zlib.crc32(' '.join(words).encode())} if words else set()
+        return {zlib.crc32(' '.join(words[i:i + size]).encode())
+                for i in range(len(words) - size + 1)}
+
+    def signature(self, shingles):
+        """Densified one-permutation MinHash signature of a shingle set
+
+        An empty bin takes the value of the next non-empty bin (wrapping
+        around), offset by its distance to it. Without this, title-only
+        articles with a handful of shingles leave most bins empty and all
+        of them collide in the bands made only of empty bins.
+        """
+        num_bins = self.num_bins
+        signature = [_EMPTY_BIN] * num_bins
+        for h in shingles:
+            slot = h % num_bins
+            value = h // num_bins
+            if value < signature[slot]:
+                signature[slot] = value
+
+        if _EMPTY_BIN in signature and len(set(signature)) > 1:
+            # Real values are below _EMPTY_BIN // num_bins, so offsets never collide with them
+            step = _EMPTY_BIN // num_bins + 1
+            densified = list(signature)
+            following = None        # (slot, value) of the next non-empty bin
+            for slot in range(2 * num_bins - 1, -1, -1):
+                value = signature[slot % num_bins]
+                if value != _EMPTY_BIN:
+                    following = (slot, value)
+                elif following and slot < num_bins:
+                    densified[slot] = following[1] + (following[0] - slot) * step
+            signature = densified
+        return signature
+
+    def find_groups(self, articles):
+        """Return lists of article indices that are near-duplicates of each other"""
+        shingle_sets = [self.shingles(article) for article in articles]
+
+        parent = list(range(len(articles)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        buckets = defaultdict(list)
+        rows = self.rows
+        for index, shingles in enumerate(shingle_sets):
+            if not shingles:
+                continue
+            signature = self.signature(shingles)
+            for band in range(self.bands):
+                key = (band, tuple(signature[band * rows:(band + 1) * rows]))
+                buckets[key].append(index)
+
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            for position, i in enumerate(members):
+                for j in members[position + 1:]:
+                    root_i, root_j = find(i), find(j)
+                    if root_i == root_j:
+                        continue
+                    a, b = shingle_sets[i], shingle_sets[j]
+                    if len(a & b) >= self.threshold * len(a | b):
+                        parent[max(root_i, root_j)] = min(root_i, root_j)
+
+        groups = defaultdict(list)
+        for index in range(len(articles)):
+            groups[find(index)].append(index)
+        return [members for members in groups.values() if len(members) > 1]
+
+    def collapse(self, articles):
+        """Keep one representative per duplicate group, preserving order
+
+        The representative is the copy from the highest-priority source (ties
+        go to the higher relevance score, then the earlier article); the
+        other sources are listed on it as 'also_reported_by'.
+        """
+        dropped = set()
+        for members in self.find_groups(articles):
+            best = min(members, key=lambda i: (
+                SOURCE_PRIORITY_RANK.get(articles[i].get('priority'), len(SOURCE_PRIORITY_RANK)),
+                -articles[i].get('relevance_score', 0),
+                i
+            ))
+            others = [i for i in members if i != best]
+            sources = [articles[i]['source'] for i in others if articles[i]['source'] != articles[best]['source']]
+            if sources:
+                articles[best]['also_reported_by'] = list(dict.fromkeys(sources))
+            dropped.update(others)
+
+        return [article for index, article in enumerate(articles) if index not in dropped]
@@ -0,0 +1,101 @@
+import hashlib
+import heapq
+import json
+
+from classifier import ArticleClassifier, SUMMARY_CATEGORIES, PODCAST_CATEGORIES
+
+# How many articles each output actually renders
+SUMMARY_LIMITS = {'critical': 10}   # text summary lists 10 critical stories
+DEFAULT_SUMMARY_LIMIT = 5
+PODCAST_LIMIT = 8
+TOP_STORIES_LIMIT = 15
+
+
+def article_rank(article):
+    """Ordering shared by the filter and every renderer"""
+    return (article.get('relevance_score', 0), article.get('published', ''))
+
+
+class TopK:
+    """Bounded min-heap keeping the k highest-ranked items seen
+
+    add() is O(log k) and memory is O(k), so selecting what a renderer shows
+    from n articles costs O(n log k) instead of a full O(n log n) sort.
+    total counts every item offered. Ties keep arrival order, matching a
+    stable descending sort of the full list. k=None keeps everything and
+    k <= 0 keeps nothing.
+    """
+    def __init__(self, k, key=article_rank):
+        self.k = k
+        self.key = key
+        self.total = 0
+        self._heap = []         # (rank, -arrival, item); arrival makes entries unique
+
+    def add(self, item):
+        self.total += 1
+        entry = (self.key(item), -self.total, item)
+        if self.k is None or len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif self._heap and entry > self._heap[0]:
+            heapq.heapreplace(self._heap, entry)
+
+    def extend(self, items):
+        for item in items:
+            self.add(item)
+        return self
+
+    def items(self):
+        """Retained items, best first"""
+        return [entry[2] for entry in sorted(self._heap, reverse=True)]
+
+
+class ArticleDigest:
+    """Bounded per-category view of a run, holding only what renderers show
+
+    Every category keeps a TopK sized to what the outputs render. Articles
+    are added one at a time (for example straight from
+    AINewsCollector.iter_relevant_articles), so memory stays flat no matter
+    how many feeds are collected. Both renderers consume a digest; plain
+    article lists are converted with from_articles.
+    """
+    def __init__(self, classifier=None):
+        self.classifier = classifier or ArticleClassifier()
+        self.total = 0
+        self.summary_categories = {
+            category: TopK(SUMMARY_LIMITS.get(category, DEFAULT_SUMMARY_LIMIT))
+            for category in SUMMARY_CATEGORIES
+        }
+        self.podcast_categories = {category: TopK(PODCAST_LIMIT) for category in PODCAST_CATEGORIES}
+        self.top_stories = TopK(TOP_STORIES_LIMIT)
+
+    @classmethod
+    def from_articles(cls, articles, classifier=None):
+        digest = cls(classifier)
+        digest.extend(articles)
+        return digest
+
+    def add(self, article):
+        if 'summary_category' not in article or 'podcast_category' not in article:
+            self.classifier.classify(article)
+        self.total += 1
+        self.summary_categories[article['summary_category']].add(article)
+        self.podcast_categories[article['podcast_category']].add(article)
+        self.top_stories.add(article)
+
+    def extend(self, articles):
+        for article in articles:
+            self.add(article)
+        return self
+
+    def fingerprint(self):
+        """Hash of everything renderers read from the digest, for RenderCache keys"""
+        def bucket(top):
+            return [top.total, [dict(article.items()) for article in top.items()]]
+
+        data = json.dumps([
+            self.total,
+            {category: bucket(top) for category, top in self.summary_categories.items()},
+            {category: bucket(top) for category, top in self.podcast_categories.items()},
+            bucket(self.top_stories)
+        ], sort_keys=True, default=str)
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
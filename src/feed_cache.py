@@ -0,0 +1,99 @@
+import json
+import os
+import threading
+import logging
+
+class FeedCache:
+    """On-disk cache of HTTP validators and last parsed entries per feed URL
+
+    Each feed URL maps to the ETag and Last-Modified values returned by the
+    server together with the entries parsed from that response. When a
+    conditional request comes back 304 Not Modified the cached entries are
+    reused, so an unchanged feed costs no download and no parse.
+
+    Entries parsed from a body cut short at a look-back cutoff (see
+    FeedScanner) are stored with that cutoff. A later run looking further
+    back sends no validators for the feed, so it gets the full feed again
+    instead of a 304 replaying the truncated entries.
+    """
+    def __init__(self, path="data/feed_cache.json"):
+        self.path = path
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._feeds = {}
+        self._changed = set()
+        self.load()
+
+    def load(self):
+        """Load the cache from disk, starting empty if it is missing or corrupt"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                self._feeds = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable feed cache {self.path}: {e}")
+            self._feeds = {}
+
+    def get(self, url):
+        """Return the cached record for url, or None"""
+        with self._lock:
+            return self._feeds.get(url)
+
+    def validators(self, url, cutoff=None):
+        """Return (etag, modified) to send with a conditional request for url
+
+        Returns (None, None) when the cached entries were truncated at a
+        cutoff later than cutoff, as they would miss older entries.
+        """
+        record = self.get(url) or {}
+        truncated_at = record.get('cutoff')
+        if truncated_at and (cutoff is None or cutoff.isoformat() < truncated_at):
+            return None, None
+        return record.get('etag'), record.get('modified')
+
+    def update(self, url, etag, modified, entries, cutoff=None):
+        """Store fresh validators and entries for url
+
+        cutoff is the datetime the entries were truncated at, if they were.
+        """
+        with self._lock:
+            self._feeds[url] = {
+                'etag': etag,
+                'modified': modified,
+                'entries': entries,
+                'cutoff': cutoff.isoformat() if cutoff else None
+            }
+            self._changed.add(url)
+
+    def apply(self, changes):
+        """Take over records updated elsewhere (see changes())"""
+        with self._lock:
+            self._feeds.update(changes)
+            self._changed.update(changes)
+
+    def changes(self, urls=None):
+        """{url: record} updated since loading, optionally only for urls"""
+        with self._lock:
+            changed = self._changed if urls is None else self._changed.intersection(urls)
+            return {url: self._feeds[url] for url in changed if url in self._feeds}
+
+    def prune(self, urls):
+        """Drop cached feeds whose URL is no longer configured"""
+        keep = set(urls)
+        with self._lock:
+            for url in list(self._feeds):
+                if url not in keep:
+                    del self._feeds[url]
+
+    def save(self):
+        """Write the cache to disk atomically"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{self.path}.tmp"
+        with self._lock:
+            with open(tmp_path, 'w') as f:
+                json.dump(self._feeds, f)
+        os.replace(tmp_path, self.path)
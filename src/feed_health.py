@@ -0,0 +1,106 @@
+import json
+import os
+import threading
+import time
+import logging
+
+class FeedHealth:
+    """Persisted circuit breaker over feed URLs
+
+    Every fetch outcome is recorded per URL. After failure_threshold
+    consecutive failures the feed's circuit opens and it is skipped
+    (no request, no politeness sleep) for base_backoff seconds, doubling
+    with every further failure up to max_backoff. Once the backoff has
+    passed the feed is tried again; one success closes the circuit.
+    State survives between runs. The default backoffs are longer than the
+    weekly schedule, so an open circuit outlasts the next run: a dead feed
+    is skipped for one run, then two, four, and is eventually tried only
+    every eight weeks instead of timing out every run. Shorten them when
+    running more often (e.g. in daemon mode).
+    """
+    def __init__(self, path="data/feed_health.json", failure_threshold=3,
+                 base_backoff=8 * 86400, max_backoff=56 * 86400):
+        self.path = path
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._feeds = {}
+        self._changed = set()
+        self.load()
+
+    def load(self):
+        """Load feed health from disk, starting empty if missing or corrupt"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                self._feeds = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable feed health {self.path}: {e}")
+            self._feeds = {}
+
+    def open_until(self, url, now=None):
+        """Unix time until which url is skipped, or None if it may be fetched"""
+        now = time.time() if now is None else now
+        with self._lock:
+            state = self._feeds.get(url)
+        if state and state['open_until'] and state['open_until'] > now:
+            return state['open_until']
+        return None
+
+    def record_success(self, url):
+        with self._lock:
+            if url in self._feeds:
+                del self._feeds[url]
+                self._changed.add(url)
+
+    def record_failure(self, url, error, now=None):
+        """Count a failure and open the circuit once the threshold is reached"""
+        now = time.time() if now is None else now
+        with self._lock:
+            state = self._feeds.get(url, {'failures': 0, 'open_until': None, 'last_error': None})
+            state['failures'] += 1
+            state['last_error'] = str(error)
+            excess = state['failures'] - self.failure_threshold
+            if excess >= 0:
+                state['open_until'] = now + min(self.max_backoff, self.base_backoff * 2 ** excess)
+            self._feeds[url] = state
+            self._changed.add(url)
+
+    def changes(self, urls=None):
+        """{url: state or None} changed since loading, optionally only for urls"""
+        with self._lock:
+            changed = self._changed if urls is None else self._changed.intersection(urls)
+            return {url: self._feeds.get(url) for url in changed}
+
+    def apply(self, changes):
+        """Take over states recorded elsewhere (see changes())"""
+        with self._lock:
+            for url, state in changes.items():
+                if state is None:
+                    self._feeds.pop(url, None)
+                else:
+                    self._feeds[url] = state
+                self._changed.add(url)
+
+    def prune(self, urls):
+        """Forget feeds no longer configured"""
+        keep = set(urls)
+        with self._lock:
+            for url in list(self._feeds):
+                if url not in keep:
+                    del self._feeds[url]
+
+    def save(self):
+        """Write feed health to disk atomically"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{self.path}.tmp"
+        with self._lock:
+            with open(tmp_path, 'w') as f:
+                json.dump(self._feeds, f, indent=2)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,117 @@
+import xml.parsers.expat
+from datetime import datetime
+
+ENTRY_TAGS = {'item', 'entry'}
+# Elements feedparser reads into 'published'; dc:date and <updated> are not among them
+PUBLISHED_TAGS = {'pubdate', 'published', 'issued'}
+
+
+def _local(name):
+    return name.rsplit(':', 1)[-1].lower()
+
+
+class FeedScanner:
+    """Streaming pass over raw RSS/Atom bytes that finds where a feed goes stale
+
+    Big date-ordered feeds (arXiv listings, long news archives) carry far
+    more entries than the look-back window needs, and feedparser builds
+    every one of them before the collector throws most away. The scanner
+    walks the document with expat in chunks, yielding each entry's published
+    date as its closing tag is reached, and truncate() cuts the document
+    after the first `stale_run` consecutive entries that fall before the
+    cutoff. feedparser then parses only that prefix, so entries are built
+    exactly as before.
+
+    Undated entries are always kept (the collector dates them as first
+    seen), so the scan goes on past the stale run and the cut moves to
+    just after the last undated entry. The cut is only made if every dated
+    entry is in newest-first order; anything else (unordered feeds,
+    malformed XML) is left for feedparser to parse in full.
+    """
+    def __init__(self, stale_run=3, chunk_size=64 * 1024):
+        self.stale_run = stale_run
+        self.chunk_size = chunk_size
+
+    def iter_entries(self, content):
+        """Yield (published, end_offset, open_tags) for each entry in content
+
+        published is a naive UTC datetime or None, end_offset is the byte
+        offset just past the entry's closing tag and open_tags lists the
+        enclosing elements still open at that point. Raises
+        xml.parsers.expat.ExpatError on malformed XML.
+        """
+        # feedparser's own date parser, so the cut point agrees exactly with
+        # the published dates of the entries feedparser later builds
+        from feedparser.datetimes import _parse_date
+
+        parser = xml.parsers.expat.ParserCreate()
+        stack = []
+        done = []
+        state = {'entry_depth': None, 'field': None, 'text': [], 'published': None}
+
+        def start(name, attrs):
+            stack.append(name)
+            local = _local(name)
+            if state['entry_depth'] is None:
+                if local in ENTRY_TAGS:
+                    state['entry_depth'] = len(stack)
+                    state['published'] = None
+            elif len(stack) == state['entry_depth'] + 1 and local in PUBLISHED_TAGS:
+                state['field'] = name
+                state['text'] = []
+
+        def end(name):
+            depth = len(stack)
+            stack.pop()
+            if state['field'] == name and depth == state['entry_depth'] + 1:
+                # Like feedparser, the last published-type element wins
+                parsed = _parse_date(''.join(state['text']).strip())
+                state['published'] = datetime(*parsed[:6]) if parsed else None
+                state['field'] = None
+            elif depth == state['entry_depth']:
+                state['entry_depth'] = None
+                end_offset = content.index(b'>', parser.CurrentByteIndex) + 1
+                done.append((state['published'], end_offset, list(stack)))
+
+        def text(data):
+            if state['field'] is not None:
+                state['text'].append(data)
+
+        parser.StartElementHandler = start
+        parser.EndElementHandler = end
+        parser.CharacterDataHandler = text
+
+        for offset in range(0, len(content), self.chunk_size):
+            parser.Parse(content[offset:offset + self.chunk_size], False)
+            yield from done
+            done.clear()
+        parser.Parse(b'', True)
+        yield from done
+
+    def truncate(self, content, cutoff):
+        """Return content cut after the stale run and the last undated entry, or content as is"""
+        if content[:2] in (b'\xff\xfe', b'\xfe\xff') or b'\x00' in content[:4]:
+            return content          # UTF-16/32; the closing tags are written as UTF-8
+        try:
+            previous = None
+            stale = 0
+            cut = None              # (end_offset, open_tags) of the last entry to keep
+            for published, end_offset, open_tags in self.iter_entries(content):
+                if published is None:
+                    stale = 0
+                    if cut:
+                        cut = (end_offset, open_tags)
+                    continue
+                if previous is not None and published > previous:
+                    return content          # not newest-first, parse everything
+                previous = published
+                stale = stale + 1 if published < cutoff else 0
+                if stale >= self.stale_run and cut is None:
+                    cut = (end_offset, open_tags)
+        except (xml.parsers.expat.ExpatError, ValueError):
+            return content
+        if cut is None:
+            return content
+        end_offset, open_tags = cut
+        closing = ''.join(f"</{tag}>" for tag in reversed(open_tags))
+        return content[:end_offset] + closing.encode('utf-8')
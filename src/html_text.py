@@ -0,0 +1,133 @@
+import hashlib
+import html
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+import logging
+
+# Elements whose content is never text: dropped with everything inside
+DROP_TAGS = ('script', 'style', 'noscript', 'iframe', 'object', 'svg', 'template')
+# Elements that separate words, so "<p>a</p><p>b</p>" becomes "a b", not "ab"
+BLOCK_TAGS = ('p', 'div', 'br', 'li', 'ul', 'ol', 'dl', 'dt', 'dd', 'h1', 'h2', 'h3', 'h4',
+              'h5', 'h6', 'blockquote', 'pre', 'table', 'tr', 'td', 'th', 'hr', 'section',
+              'article', 'header', 'footer', 'figure', 'figcaption', 'aside', 'nav')
+
+_TAG_RE = re.compile(r'<[^>]*>')
+
+
+def _normalize(text):
+    """Collapse all whitespace (including non-breaking spaces) to single spaces"""
+    return ' '.join(text.split())
+
+
+class HTMLTextCleaner:
+    """Convert feed summary HTML to plain text, cached by content hash
+
+    Summaries arrive as HTML full of images, tracking pixels and markup,
+    which keyword scans would otherwise match inside attributes and the
+    outputs would carry verbatim. clean() parses the markup with lxml,
+    drops script/style-like elements, keeps word boundaries between block
+    elements, decodes entities and collapses whitespace. Text without
+    markup skips the parser entirely.
+
+    Results are cached by a BLAKE2 hash of the input and the cache is kept
+    on disk (least recently used entries beyond max_entries are dropped on
+    save), so entries repeated across runs are never cleaned twice.
+    """
+    def __init__(self, path=None, max_entries=50000):
+        self.path = path
+        self.max_entries = max_entries
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._texts = OrderedDict()
+        self._new = {}
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        if path:
+            self.load()
+
+    def load(self):
+        """Load cached texts from disk, starting empty if missing or corrupt"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                self._texts = OrderedDict(json.load(f))
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable HTML text cache {self.path}: {e}")
+            self._texts = OrderedDict()
+
+    def clean(self, markup):
+        """Return markup as whitespace-normalized plain text"""
+        if not markup:
+            return ''
+        if '<' not in markup and '&' not in markup:
+            return _normalize(markup)
+
+        key = hashlib.blake2b(markup.encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest()
+        with self._lock:
+            text = self._texts.get(key)
+            if text is not None:
+                self._texts.move_to_end(key)
+                self.hits += 1
+                return text
+
+        text = self._to_text(markup)
+        with self._lock:
+            self._texts[key] = text
+            self._new[key] = text
+            self._dirty = True
+            self.misses += 1
+        return text
+
+    def _to_text(self, markup):
+        # Imported on first use; runs that only re-render never load lxml
+        from lxml import etree
+        from lxml import html as lxml_html
+
+        try:
+            fragment = lxml_html.fragment_fromstring(markup, create_parent='div')
+        except (etree.ParserError, ValueError):
+            # Not parseable as HTML: strip anything tag-like instead
+            return _normalize(html.unescape(_TAG_RE.sub(' ', markup)))
+
+        etree.strip_elements(fragment, *DROP_TAGS, with_tail=False)
+        for element in fragment.iter(*BLOCK_TAGS):
+            element.text = ' ' + element.text if element.text else ' '
+            element.tail = ' ' + element.tail if element.tail else ' '
+        return _normalize(fragment.text_content())
+
+    def take_changes(self):
+        """{hash: text} cleaned since the last call, e.g. to ship from a worker"""
+        with self._lock:
+            changes, self._new = self._new, {}
+        return changes
+
+    def apply(self, changes):
+        """Add texts cleaned elsewhere (see take_changes())"""
+        with self._lock:
+            self._texts.update(changes)
+            self._dirty = self._dirty or bool(changes)
+
+    def save(self):
+        """Write the most recently used max_entries texts to disk atomically
+
+        Does nothing unless something was cleaned since the last save.
+        """
+        if not self.path or not self._dirty:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{self.path}.tmp"
+        with self._lock:
+            while len(self._texts) > self.max_entries:
+                self._texts.popitem(last=False)
+            with open(tmp_path, 'w') as f:
+                json.dump(self._texts, f)
+            self._dirty = False
+        os.replace(tmp_path, self.path)
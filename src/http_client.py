@@ -0,0 +1,137 @@
+import http.cookiejar
+import time
+
+import feedparser
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+
+# Accept-Encoding urllib3 can decode here: gzip and deflate, plus br / zstd
+# when the optional brotli / zstandard packages are installed
+ACCEPT_ENCODING = make_headers(accept_encoding=True)['accept-encoding']
+
+
+class ResponseTooLarge(ValueError):
+    """Raised when a response body exceeds the client's max_bytes"""
+
+
+class FeedTimeout(TimeoutError):
+    """Raised when a fetch runs past its deadline"""
+
+
+class FeedResponse:
+    """Status, headers and fully read body of one feed request"""
+    def __init__(self, url, status_code, headers, content, wire_bytes):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.wire_bytes = wire_bytes      # bytes on the wire, before decompression
+
+
+class FeedHTTPClient:
+    """Pooled, compressed and size-capped HTTP fetching for feeds
+
+    One requests.Session is shared by every fetch thread. Its connection
+    pool keeps connections alive, so feeds on the same host reuse them
+    instead of paying a new TCP and TLS handshake each time. Bodies are
+    requested compressed and streamed in chunks. A download stops with
+    ResponseTooLarge once its decompressed size passes max_bytes, so a huge
+    or runaway feed cannot exhaust memory. Cookies are never stored, so
+    threads share no mutable session state.
+
+    Every request has connect and read timeouts, and a download also stops
+    with FeedTimeout at its deadline, so a server trickling bytes cannot
+    hold a fetch open for longer than the deadline plus one read timeout.
+    """
+    def __init__(self, pool_size=8, max_bytes=20 * 1024 * 1024, chunk_size=64 * 1024,
+                 connect_timeout=10, read_timeout=30):
+        self.max_bytes = max_bytes
+        self.chunk_size = chunk_size
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+
+        self.session = requests.Session()
+        self.session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+        self.session.headers.update({
+            'User-Agent': feedparser.USER_AGENT,
+            'Accept': feedparser.http.ACCEPT_HEADER,
+            'Accept-Encoding': ACCEPT_ENCODING
+        })
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def get(self, url, etag=None, modified=None, deadline=None):
+        """GET url, conditionally when validators are known, and read the body
+
+        HTTP errors raise requests.HTTPError; 304 responses are returned
+        with an empty body. deadline is a time.time() value; timeouts are
+        shortened to fit it and reading stops with FeedTimeout once it passes.
+        """
+        connect_timeout, read_timeout = self._timeouts(url, deadline)
+
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if modified:
+            headers['If-Modified-Since'] = modified
+
+        with self.session.get(url, headers=headers, stream=True,
+                              timeout=(connect_timeout, read_timeout)) as response:
+            if response.status_code != 304:
+                response.raise_for_status()
+
+            declared = response.headers.get('Content-Length')
+            if declared and declared.isdigit() and int(declared) > self.max_bytes:
+                raise ResponseTooLarge(f"{url} declares {declared} bytes, limit is {self.max_bytes}")
+
+            read1 = getattr(response.raw, 'read1', None)
+            if read1 is not None:
+                # urllib3 2: returns after a single socket read, so a server
+                # trickling bytes cannot keep one read going past the deadline
+                body = iter(lambda: read1(self.chunk_size, decode_content=True), b'')
+            else:
+                body = response.iter_content(self.chunk_size)
+
+            chunks = []
+            size = 0
+            for chunk in body:
+                size += len(chunk)
+                if size > self.max_bytes:
+                    raise ResponseTooLarge(f"{url} exceeds {self.max_bytes} bytes")
+                if deadline is not None and time.time() > deadline:
+                    raise FeedTimeout(f"{url}: deadline passed after {size} bytes")
+                chunks.append(chunk)
+
+            return FeedResponse(response.url, response.status_code, response.headers,
+                                b''.join(chunks), response.raw.tell())
+
+    def resolve(self, url, deadline=None):
+        """Follow url's redirects and return the URL they end at
+
+        A HEAD request is enough for redirectors; servers that refuse HEAD
+        get a GET whose body is never read. HTTP errors raise
+        requests.HTTPError.
+        """
+        timeout = self._timeouts(url, deadline)
+        response = self.session.head(url, allow_redirects=True, timeout=timeout)
+        if response.status_code in (403, 405, 501):
+            with self.session.get(url, allow_redirects=True, stream=True, timeout=timeout) as response:
+                pass
+        response.raise_for_status()
+        return response.url
+
+    def _timeouts(self, url, deadline):
+        """(connect, read) timeouts, shortened to fit deadline"""
+        connect_timeout, read_timeout = self.connect_timeout, self.read_timeout
+        if deadline is not None:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                raise FeedTimeout(f"{url}: deadline passed before the request")
+            connect_timeout = min(connect_timeout, remaining)
+            read_timeout = min(read_timeout, remaining)
+        return connect_timeout, read_timeout
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,124 @@
+from collections import deque
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over several named keyword groups
+
+    The automaton is compiled once from every group and then finds all
+    keywords of all groups in a single left-to-right pass over the text.
+    Results are per-group hit counts with the same semantics as
+    ``sum(1 for kw in group if kw in text)``: each keyword counts once no
+    matter how often it occurs, and a keyword listed twice counts twice.
+    Keywords are matched as given, so callers lowercase both sides.
+    """
+    def __init__(self, groups):
+        self.groups = list(groups)
+        self._weights = []          # pattern id -> [(group, multiplicity)]
+        self._always = {}           # empty keywords match every text
+        self._compile(groups)
+
+    def _compile(self, groups):
+        """Build the trie, failure links and a full transition table"""
+        pattern_ids = {}
+        goto = [{}]
+        terminal = [None]
+
+        for group, keywords in groups.items():
+            for keyword in keywords:
+                if not keyword:
+                    self._always[group] = self._always.get(group, 0) + 1
+                    continue
+                if keyword not in pattern_ids:
+                    pattern_ids[keyword] = len(self._weights)
+                    self._weights.append({})
+                    state = 0
+                    for ch in keyword:
+                        if ch not in goto[state]:
+                            goto[state][ch] = len(goto)
+                            goto.append({})
+                            terminal.append(None)
+                        state = goto[state][ch]
+                    terminal[state] = (pattern_ids[keyword], len(keyword))
+                weights = self._weights[pattern_ids[keyword]]
+                weights[group] = weights.get(group, 0) + 1
+
+        self._weights = [list(weights.items()) for weights in self._weights]
+        self.pattern_count = len(self._weights)
+
+        # Breadth-first pass: failure links, merged outputs and a dense
+        # transition dict per state so scanning never walks failure chains
+        fail = [0] * len(goto)
+        outputs = [()] * len(goto)
+        delta = [None] * len(goto)
+        delta[0] = dict(goto[0])
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            own = (terminal[state],) if terminal[state] else ()
+            outputs[state] = own + outputs[fail[state]]
+            delta[state] = dict(delta[fail[state]])
+            for ch, child in goto[state].items():
+                fail[child] = delta[fail[state]].get(ch, 0) if state else 0
+                delta[state][ch] = child
+                queue.append(child)
+
+        self._delta = delta
+        self._outputs = outputs
+
+    def pattern_weights(self):
+        """Yield (pattern_id, group, multiplicity) for every compiled keyword"""
+        for pattern_id, weights in enumerate(self._weights):
+            for group, multiplicity in weights:
+                yield pattern_id, group, multiplicity
+
+    def counts(self, hits):
+        """Turn a set of matched pattern ids into per-group counts"""
+        counts = dict.fromkeys(self.groups, 0)
+        counts.update(self._always)
+        weights = self._weights
+        for pattern_id in hits:
+            for group, multiplicity in weights[pattern_id]:
+                counts[group] += multiplicity
+        return counts
+
+    def scan(self, text):
+        """Return per-group hit counts for text"""
+        delta = self._delta
+        outputs = self._outputs
+        hits = set()
+        state = 0
+        for ch in text:
+            state = delta[state].get(ch, 0)
+            if outputs[state]:
+                for pattern_id, _ in outputs[state]:
+                    hits.add(pattern_id)
+        return self.counts(hits)
+
+    def scan_fields(self, title, summary):
+        """Scan ``title + ' ' + summary`` once
+
+        Returns (title_counts, summary_counts, combined_counts), identical to
+        scanning the title, the summary and the joined text separately.
+        """
+        title_hits, summary_hits, combined_hits = self.scan_field_hits(title, summary)
+        return self.counts(title_hits), self.counts(summary_hits), self.counts(combined_hits)
+
+    def scan_field_hits(self, title, summary):
+        """Like scan_fields, but return the sets of matched pattern ids"""
+        text = title + ' ' + summary
+        split = len(title)
+        delta = self._delta
+        outputs = self._outputs
+        title_hits = set()
+        summary_hits = set()
+        combined_hits = set()
+        state = 0
+        for end, ch in enumerate(text):
+            state = delta[state].get(ch, 0)
+            if outputs[state]:
+                for pattern_id, length in outputs[state]:
+                    combined_hits.add(pattern_id)
+                    if end < split:
+                        title_hits.add(pattern_id)
+                    elif end - length >= split:
+                        summary_hits.add(pattern_id)
+        return title_hits, summary_hits, combined_hits
@@ -0,0 +1,201 @@
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from urllib.parse import unquote_plus, urlsplit, urlunsplit
+import logging
+
+# Query parameters that only track where a click came from
+TRACKING_PREFIXES = ('utm_', 'pk_', 'mtm_')
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'gbraid', 'wbraid', 'msclkid', 'yclid', 'igshid', 'twclid',
+    'mc_cid', 'mc_eid', '_hsenc', '_hsmi', 'mkt_tok', 'ocid', 'cmpid', 'icid', 'ncid',
+    'ref_src', 'ref_url', 'soc_src', 'soc_trk', 'sr_share', 'spm', 'wt.mc_id',
+    'at_medium', 'at_campaign', 'amp', 'outputtype', 'guccounter', 'guce_referrer', 'guce_referrer_sig'
+}
+
+# Hosts whose feed links are redirects to the actual article
+DEFAULT_RESOLVE_HOSTS = [
+    'news.google.com', 'feedproxy.google.com', 'feeds.feedburner.com',
+    't.co', 'bit.ly', 'buff.ly', 'dlvr.it', 'ow.ly', 'lnkd.in', 'trib.al'
+]
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+_SLASHES_RE = re.compile(r'/{2,}')
+_AMP_EXTENSION_RE = re.compile(r'\.amp(?=\.html?$)')
+
+
+def _strip_query(query):
+    """Drop tracking parameters, keeping the rest in order and as encoded"""
+    kept = []
+    for pair in query.split('&'):
+        if not pair:
+            continue
+        name = unquote_plus(pair.split('=', 1)[0]).lower()
+        if name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES):
+            continue
+        kept.append(pair)
+    return kept
+
+
+def _unwrap_amp_cache(host, path):
+    """The publisher URL inside a Google AMP cache URL, or None"""
+    if host.endswith('.cdn.ampproject.org') and path.startswith('/c/'):
+        inner = path[len('/c/'):]
+    elif host == 'google.com' and path.startswith('/amp/'):
+        inner = path[len('/amp/'):]
+    else:
+        return None
+    if inner.startswith('s/'):
+        return 'https://' + inner[len('s/'):]
+    return 'http://' + inner
+
+
+def canonical_url(link):
+    """Normalize a link so URLs of the same page share one identity
+
+    Lowercases scheme and host, drops the fragment, a leading "www.",
+    default ports, tracking query parameters (utm_*, fbclid, ...) and AMP
+    variants (AMP cache hosts, /amp and .amp paths, ?amp=1), collapses
+    repeated and trailing slashes and sorts the remaining query.
+    Idempotent: canonical_url(canonical_url(x)) == canonical_url(x).
+    """
+    parts = urlsplit(link.strip())
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS:
+        return urlunsplit((scheme, parts.netloc.lower(), parts.path or '/', parts.query, ''))
+
+    host = (parts.hostname or '').rstrip('.')
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    while host.startswith('www.'):
+        host = host[len('www.'):]
+    if ':' in host:     # IPv6 literal
+        host = f"[{host}]"
+
+    inner = _unwrap_amp_cache(host, parts.path)
+    if inner:
+        return canonical_url(inner + (f"?{parts.query}" if parts.query else ''))
+
+    netloc = host if port in (None, DEFAULT_PORTS[scheme]) else f"{host}:{port}"
+    path = _SLASHES_RE.sub('/', parts.path)
+    while _AMP_EXTENSION_RE.search(path):
+        path = _AMP_EXTENSION_RE.sub('', path)
+    path = path.rstrip('/')
+    while path.endswith(('/amp', '.amp')):
+        path = path[:-len('/amp')].rstrip('/')
+    return urlunsplit((scheme, netloc, path or '/', '&'.join(sorted(_strip_query(parts.query))), ''))
+
+
+def strip_tracking(link):
+    """Link without tracking query parameters and fragment, otherwise as given
+
+    Unlike canonical_url this keeps a working URL for readers: host, path
+    and the order of the remaining query are left alone.
+    """
+    link = link.strip()
+    parts = urlsplit(link)
+    if not parts.query and not parts.fragment:
+        return link
+    return urlunsplit(parts._replace(query='&'.join(_strip_query(parts.query)), fragment=''))
+
+
+class RedirectCache:
+    """Persisted map from redirecting URLs to the URL they lead to
+
+    Targets never change for the redirectors this is used with, so an
+    entry is kept until it is among the oldest beyond max_entries.
+    """
+    def __init__(self, path="data/redirect_cache.json", max_entries=100000):
+        self.path = path
+        self.max_entries = max_entries
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._targets = OrderedDict()
+        self._dirty = False
+        self.load()
+
+    def load(self):
+        """Load redirects from disk, starting empty if missing or corrupt"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                self._targets = OrderedDict(json.load(f))
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable redirect cache {self.path}: {e}")
+            self._targets = OrderedDict()
+
+    def get(self, url):
+        with self._lock:
+            return self._targets.get(url)
+
+    def set(self, url, target):
+        with self._lock:
+            self._targets[url] = target
+            self._dirty = True
+
+    def save(self):
+        """Write the newest max_entries redirects to disk atomically, if any were added"""
+        if not self._dirty:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{self.path}.tmp"
+        with self._lock:
+            while len(self._targets) > self.max_entries:
+                self._targets.popitem(last=False)
+            with open(tmp_path, 'w') as f:
+                json.dump(self._targets, f)
+            self._dirty = False
+        os.replace(tmp_path, self.path)
+
+
+class LinkCanonicalizer:
+    """Turn feed entry links into the links articles show readers
+
+    Links on resolve_hosts (news aggregators and link shorteners) are
+    redirects; they are followed once with the resolve callable passed to
+    article_link() and the target is kept in the RedirectCache (keyed by
+    the redirect's canonical_url), so each redirect is followed at most
+    once across all runs. Every link has its tracking parameters stripped.
+    canonical_url of the result is what identifies the article (archive,
+    daemon window); the link itself stays the one readers click.
+    """
+    def __init__(self, redirects=None, resolve_hosts=DEFAULT_RESOLVE_HOSTS):
+        self.redirects = redirects
+        self.resolve_hosts = {host.lower() for host in resolve_hosts}
+        self.logger = logging.getLogger(__name__)
+
+    def needs_resolving(self, url):
+        host = urlsplit(url).hostname or ''
+        return host in self.resolve_hosts or host.split('.', 1)[-1] in self.resolve_hosts
+
+    def article_link(self, link, resolve=None):
+        """Link to show for link, resolving redirectors when resolve is given
+
+        resolve(link) returns the URL link redirects to, or None to leave
+        it unresolved for now.
+        """
+        shown = strip_tracking(link)
+        if self.redirects is None or not self.needs_resolving(shown):
+            return shown
+
+        key = canonical_url(link)
+        target = self.redirects.get(key)
+        if target is None and resolve is not None:
+            try:
+                resolved = resolve(link.strip())
+            except Exception as e:
+                self.logger.info(f"Could not resolve {shown}: {e}")
+                resolved = None
+            if resolved:
+                target = strip_tracking(resolved)
+                self.redirects.set(key, target)
+        return target or shown
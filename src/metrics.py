@@ -0,0 +1,104 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+# Per-feed fields exported as Prometheus gauges: field -> (metric, help)
+FEED_GAUGES = {
+    'fetch_seconds': ('ai_news_feed_fetch_seconds', 'Time to download the feed'),
+    'parse_seconds': ('ai_news_feed_parse_seconds', 'Time to parse the feed body'),
+    'bytes': ('ai_news_feed_bytes', 'Response body size in bytes'),
+    'wire_bytes': ('ai_news_feed_wire_bytes', 'Bytes transferred before decompression'),
+    'entries': ('ai_news_feed_entries', 'Entries in the feed'),
+    'in_window': ('ai_news_feed_in_window_entries', 'Entries inside the look-back window')
+}
+
+
+def _label(value):
+    """Escape a Prometheus label value"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class RunMetrics:
+    """Per-run instrumentation of pipeline stages and individual feeds
+
+    main() times each stage with stage(), the collector reports one record
+    per feed with record_feed(), and write() exports everything as JSON plus
+    a Prometheus text-exposition file, so slow or dead feeds can be tracked
+    from run to run.
+    """
+    def __init__(self):
+        self.started_at = datetime.now()
+        self.stages = {}
+        self.feeds = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name):
+        """Time the enclosed block as pipeline stage `name`"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage(name, time.perf_counter() - start)
+
+    def add_stage(self, name, seconds):
+        """Add time measured elsewhere, e.g. in a worker process, to stage `name`"""
+        with self._lock:
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def record_feed(self, record):
+        """Store one feed's fetch record (see AINewsCollector._fetch_feed)"""
+        with self._lock:
+            self.feeds.append(record)
+
+    def to_dict(self):
+        with self._lock:
+            feeds = list(self.feeds)
+        return {
+            'started_at': self.started_at.isoformat(),
+            'stages': {name: round(seconds, 6) for name, seconds in self.stages.items()},
+            'feeds': feeds
+        }
+
+    def to_prometheus(self):
+        """Render metrics in the Prometheus text exposition format"""
+        data = self.to_dict()
+        lines = [
+            '# HELP ai_news_run_timestamp_seconds Unix time the run started',
+            '# TYPE ai_news_run_timestamp_seconds gauge',
+            f"ai_news_run_timestamp_seconds {self.started_at.timestamp():.0f}",
+            '# HELP ai_news_stage_duration_seconds Wall time of each pipeline stage',
+            '# TYPE ai_news_stage_duration_seconds gauge'
+        ]
+        for name, seconds in data['stages'].items():
+            lines.append(f'ai_news_stage_duration_seconds{{stage="{_label(name)}"}} {seconds}')
+
+        lines += [
+            '# HELP ai_news_feed_up Whether the feed was fetched without error',
+            '# TYPE ai_news_feed_up gauge'
+        ]
+        for feed in data['feeds']:
+            lines.append(f'ai_news_feed_up{{feed="{_label(feed["feed"])}"}} {0 if feed["error"] else 1}')
+
+        for field, (metric, help_text) in FEED_GAUGES.items():
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} gauge"]
+            for feed in data['feeds']:
+                if feed.get(field) is not None:
+                    lines.append(f'{metric}{{feed="{_label(feed["feed"])}"}} {feed[field]}')
+
+        return '\n'.join(lines) + '\n'
+
+    def write(self, directory='outputs'):
+        """Write run_metrics_YYYYMMDD.json and .prom to directory"""
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, f"run_metrics_{self.started_at.strftime('%Y%m%d')}")
+
+        with open(f"{base}.json", 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        with open(f"{base}.prom", 'w') as f:
+            f.write(self.to_prometheus())
+
+        return f"{base}.json", f"{base}.prom"
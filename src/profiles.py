@@ -0,0 +1,181 @@
+import heapq
+
+from article import Article, lowered_fields
+from keyword_matcher import KeywordMatcher
+
+# The weights of AINewsCollector.iter_relevant_articles
+TITLE_WEIGHT = 3
+SUMMARY_WEIGHT = 1
+HIGH_PRIORITY_WEIGHT = 2
+COMPANY_WEIGHT = 2
+SOURCE_BONUS = {'high': 2, 'medium': 1}
+MIN_SCORE = 2
+
+
+def _load_numpy():
+    """(numpy, scipy.sparse), or None when they are not installed"""
+    try:
+        import numpy
+        from scipy import sparse
+    except ImportError:
+        return None
+    return numpy, sparse
+
+
+class ProfileScorer:
+    """Score articles against many keyword profiles from a single scan
+
+    Every profile's keyword groups and the classifier's category rules are
+    compiled into one KeywordMatcher, so each article is scanned once no
+    matter how many profiles there are. The matched keywords of all
+    articles form sparse article x keyword hit matrices (title, summary and
+    combined text), and each profile's relevance score is a product of
+    those with a keyword x profile weight matrix. Scores are identical to
+    running filter_relevant_articles once per profile.
+
+    NumPy and SciPy are optional. Without them the same weighted sums are
+    taken per article in pure Python, which is slower for large profile
+    sets but gives the same results.
+    """
+    def __init__(self, profiles, classifier, use_numpy=True):
+        self.names = list(profiles)
+        self.classifier = classifier
+        self.numpy = _load_numpy() if use_numpy else None
+
+        groups = dict(classifier.groups)
+        for index, profile in enumerate(profiles.values()):
+            for group, keywords in profile.items():
+                groups[f'profile{index}:{group}'] = keywords
+        self.matcher = KeywordMatcher(groups)
+
+    def _profile_weights(self, group, weight):
+        """[(pattern_id, profile index, weight)] for one keyword group of every profile"""
+        entries = []
+        for pattern_id, name, multiplicity in self.matcher.pattern_weights():
+            prefix, _, group_name = name.partition(':')
+            if group_name == group and prefix.startswith('profile'):
+                entries.append((pattern_id, int(prefix[len('profile'):]), weight * multiplicity))
+        return entries
+
+    def _always(self, group, weight):
+        """Per-profile contribution of empty keywords, which match every text"""
+        counts = self.matcher.counts(())
+        return [weight * counts[f'profile{index}:{group}'] for index in range(len(self.names))]
+
+    def _scan(self, articles):
+        return [self.matcher.scan_field_hits(*lowered_fields(article)) for article in articles]
+
+    def _score_numpy(self, hits, bonus):
+        """(scores, excluded) as n x profiles matrices via sparse matrix products"""
+        np, sparse = self.numpy
+        n = len(hits)
+        shape = (self.matcher.pattern_count, len(self.names))
+
+        def hit_matrix(field):
+            indptr = [0]
+            indices = []
+            for article_hits in hits:
+                indices.extend(article_hits[field])
+                indptr.append(len(indices))
+            data = np.ones(len(indices), dtype=np.int64)
+            return sparse.csr_matrix((data, indices, indptr), shape=(n, shape[0]))
+
+        def weight_matrix(*groups):
+            rows, cols, data = [], [], []
+            for group, weight in groups:
+                for pattern_id, index, value in self._profile_weights(group, weight):
+                    rows.append(pattern_id)
+                    cols.append(index)
+                    data.append(value)
+            return sparse.csr_matrix((np.array(data, dtype=np.int64), (rows, cols)), shape=shape)
+
+        title, summary, combined = hit_matrix(0), hit_matrix(1), hit_matrix(2)
+        scores = (title @ weight_matrix(('keywords', TITLE_WEIGHT))
+                  + summary @ weight_matrix(('keywords', SUMMARY_WEIGHT))
+                  + combined @ weight_matrix(('high_priority', HIGH_PRIORITY_WEIGHT),
+                                             ('company', COMPANY_WEIGHT))).toarray()
+        scores += np.array([
+            sum(values) for values in zip(self._always('keywords', TITLE_WEIGHT + SUMMARY_WEIGHT),
+                                          self._always('high_priority', HIGH_PRIORITY_WEIGHT),
+                                          self._always('company', COMPANY_WEIGHT))
+        ], dtype=np.int64)
+        scores += np.array(bonus, dtype=np.int64)[:, None]
+
+        excluded = (combined @ weight_matrix(('exclude', 1))).toarray()
+        excluded += np.array(self._always('exclude', 1), dtype=np.int64)
+        return scores.tolist(), (excluded > 0).tolist()
+
+    def _score_python(self, hits, bonus):
+        """(scores, excluded) as lists of per-profile rows, one article at a time"""
+        weights = {}        # pattern id -> [(field, profile index, weight)]
+        for field, group, weight in ((0, 'keywords', TITLE_WEIGHT), (1, 'keywords', SUMMARY_WEIGHT),
+                                     (2, 'high_priority', HIGH_PRIORITY_WEIGHT),
+                                     (2, 'company', COMPANY_WEIGHT), (3, 'exclude', 1)):
+            for pattern_id, index, value in self._profile_weights(group, weight):
+                weights.setdefault(pattern_id, []).append((field, index, value))
+
+        base = [sum(values) for values in zip(self._always('keywords', TITLE_WEIGHT + SUMMARY_WEIGHT),
+                                              self._always('high_priority', HIGH_PRIORITY_WEIGHT),
+                                              self._always('company', COMPANY_WEIGHT))]
+        base_excluded = self._always('exclude', 1)
+
+        scores = []
+        excluded = []
+        for (title, summary, combined), article_bonus in zip(hits, bonus):
+            row = [value + article_bonus for value in base]
+            exclude_row = list(base_excluded)
+            for field, pattern_ids in ((0, title), (1, summary), (2, combined)):
+                for pattern_id in pattern_ids:
+                    for weight_field, index, value in weights.get(pattern_id, ()):
+                        if weight_field == field:
+                            row[index] += value
+                        elif weight_field == 3 and field == 2:
+                            exclude_row[index] += value
+            scores.append(row)
+            excluded.append([count > 0 for count in exclude_row])
+        return scores, excluded
+
+    def score(self, articles):
+        """Return (scores, excluded, hits): per-article rows with one entry per profile"""
+        hits = self._scan(articles)
+        bonus = [SOURCE_BONUS.get(article.get('priority'), 0) for article in articles]
+        if self.numpy is not None and articles:
+            scores, excluded = self._score_numpy(hits, bonus)
+        else:
+            scores, excluded = self._score_python(hits, bonus)
+        return scores, excluded, hits
+
+    def rank(self, articles, priority_level, limit=None):
+        """Return {profile name: relevant articles, best first}
+
+        Each profile gets its own copies of its articles, scored, levelled
+        with priority_level(score) and classified, so profiles never
+        overwrite each other's relevance_score.
+        """
+        articles = list(articles)
+        scores, excluded, hits = self.score(articles)
+
+        ranked = {}
+        for index, name in enumerate(self.names):
+            relevant = [
+                position for position, article in enumerate(articles)
+                if not excluded[position][index]
+                and (scores[position][index] >= MIN_SCORE or article.get('priority') == 'high')
+            ]
+
+            def rank_key(position):
+                return (scores[position][index], articles[position]['published'])
+
+            if limit is not None:
+                relevant = heapq.nlargest(limit, relevant, key=rank_key)
+            else:
+                relevant.sort(key=rank_key, reverse=True)
+
+            ranked[name] = []
+            for position in relevant:
+                article = Article(**dict(articles[position].items()))
+                article['relevance_score'] = scores[position][index]
+                article['priority_level'] = priority_level(article['relevance_score'])
+                self.classifier.classify_hits(article, self.matcher.counts(hits[position][2]))
+                ranked[name].append(article)
+        return ranked
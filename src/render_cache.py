@@ -0,0 +1,180 @@
+import hashlib
+import io
+import json
+import os
+import shutil
+import threading
+from collections import OrderedDict
+import logging
+
+
+def content_key(*parts):
+    """SHA-256 of parts serialized as canonical JSON"""
+    data = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+class RenderCache:
+    """Content-addressed cache of rendered output files
+
+    Each renderer's result is stored under a key hashing its name, its
+    RENDER_VERSION, the render date, the digest it rendered (see
+    ArticleDigest.fingerprint) and the config context given here.
+    Rendering the same articles again (a rerun on the same day, a daemon
+    render with nothing new) copies the cached files back instead of
+    rendering them. Outputs carry the date in their names and headers,
+    so the next day renders afresh. Entries are directories written
+    atomically, so renderers in separate processes can share the cache.
+    The max_entries most recently used are kept.
+
+    fragments(name) gives a renderer its FragmentCache for per-article
+    blocks, so a run where only a few stories changed renders only those.
+    """
+    MANIFEST = 'manifest.json'
+
+    def __init__(self, directory="data/render_cache", context=None, max_entries=50, max_fragments=2000):
+        self.directory = directory
+        self.context = content_key(context)
+        self.max_entries = max_entries
+        self.max_fragments = max_fragments
+        self.logger = logging.getLogger(__name__)
+
+    def key(self, name, version, *inputs):
+        return content_key(self.context, name, version, *inputs)
+
+    def restore(self, key):
+        """Copy a cached result's files back into place and return the result
+
+        Files already identical to the cached copy are left untouched.
+        Returns None on a miss.
+        """
+        entry = os.path.join(self.directory, key)
+        try:
+            with open(os.path.join(entry, self.MANIFEST), 'r') as f:
+                manifest = json.load(f)
+            for cached_name, path in manifest['files']:
+                cached = os.path.join(entry, cached_name)
+                if not _same_content(cached, path):
+                    directory = os.path.dirname(path)
+                    if directory:
+                        os.makedirs(directory, exist_ok=True)
+                    shutil.copyfile(cached, path)
+            os.utime(entry)
+        except (OSError, ValueError, KeyError) as e:
+            if not isinstance(e, FileNotFoundError):
+                self.logger.warning(f"Ignoring unreadable render cache entry {key}: {e}")
+            return None
+        return manifest['result']
+
+    def store(self, key, result):
+        """Cache result, an output path or a list of them, with copies of its files"""
+        paths = [result] if isinstance(result, str) else list(result)
+        entry = os.path.join(self.directory, key)
+        tmp_entry = f"{entry}.{os.getpid()}.{threading.get_ident()}.tmp"
+        os.makedirs(tmp_entry, exist_ok=True)
+        try:
+            files = []
+            for index, path in enumerate(paths):
+                cached_name = f"{index}-{os.path.basename(path)}"
+                shutil.copyfile(path, os.path.join(tmp_entry, cached_name))
+                files.append([cached_name, path])
+            with open(os.path.join(tmp_entry, self.MANIFEST), 'w') as f:
+                json.dump({'result': result, 'files': files}, f)
+            os.rename(tmp_entry, entry)
+        except OSError:
+            # Most likely another process stored the same key first
+            shutil.rmtree(tmp_entry, ignore_errors=True)
+            if not os.path.isdir(entry):
+                raise
+        self.prune()
+
+    def prune(self):
+        """Delete all but the max_entries most recently used entries"""
+        entries = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if os.path.isdir(path) and not name.endswith('.tmp') and name != 'fragments':
+                entries.append((os.path.getmtime(path), path))
+        entries.sort(reverse=True)
+        for _, path in entries[self.max_entries:]:
+            shutil.rmtree(path, ignore_errors=True)
+
+    def fragments(self, name):
+        """FragmentCache for the renderer name, persisted next to the entries"""
+        path = os.path.join(self.directory, 'fragments', f"{name}.json")
+        return FragmentCache(path, self.max_fragments)
+
+
+def _same_content(a, b):
+    try:
+        if os.path.getsize(a) != os.path.getsize(b):
+            return False
+        with open(a, 'rb') as f, open(b, 'rb') as g:
+            return f.read() == g.read()
+    except OSError:
+        return False
+
+
+class FragmentCache:
+    """Rendered per-article text blocks keyed by a hash of their inputs
+
+    render() returns the cached block for inputs, calling write(out) to
+    produce it only on a miss. Callers pass everything the block depends
+    on (renderer version, position, the article fields it shows) as
+    inputs. The max_entries most recently used blocks are kept on disk.
+    """
+    def __init__(self, path=None, max_entries=2000):
+        self.path = path
+        self.max_entries = max_entries
+        self.logger = logging.getLogger(__name__)
+        self._fragments = OrderedDict()
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        if path:
+            self.load()
+
+    def load(self):
+        """Load cached fragments from disk, starting empty if missing or corrupt"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                self._fragments = OrderedDict(json.load(f))
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable fragment cache {self.path}: {e}")
+            self._fragments = OrderedDict()
+
+    def render(self, write, *inputs):
+        key = content_key(*inputs)
+        text = self._fragments.get(key)
+        if text is not None:
+            self._fragments.move_to_end(key)
+            self.hits += 1
+            return text
+
+        buffer = io.StringIO()
+        write(buffer)
+        text = self._fragments[key] = buffer.getvalue()
+        self._dirty = True
+        self.misses += 1
+        return text
+
+    def save(self):
+        """Write the most recently used max_entries fragments to disk atomically
+
+        Does nothing unless a fragment was rendered since the last save.
+        """
+        if not self.path or not self._dirty:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        while len(self._fragments) > self.max_entries:
+            self._fragments.popitem(last=False)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self._fragments, f)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
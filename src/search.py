@@ -0,0 +1,62 @@
+import argparse
+import json
+import logging
+import sys
+import time
+from datetime import datetime, timedelta
+
+from article_store import ArticleStore
+from templates import plural
+
+
+def format_result(article):
+    """One search hit as two lines: date, source, score and title, then the link"""
+    published = (article.get('published') or '')[:10] or '????-??-??'
+    score = article.get('relevance_score')
+    score = f" ({score})" if score is not None else ''
+    return f"{published}  [{article.get('source')}]{score}  {article['title']}\n            {article['link']}"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Full-text search over archived articles")
+    parser.add_argument('query', help='words and "quoted phrases" to search for; all must match')
+    parser.add_argument('--db', default='data/articles.db')
+    parser.add_argument('--source', help='only articles from this source')
+    parser.add_argument('--since', help='ISO date, inclusive')
+    parser.add_argument('--until', help='ISO date, exclusive')
+    parser.add_argument('--days', type=int, help='only articles from the last N days (overrides --since)')
+    parser.add_argument('--limit', type=int, default=20, help='maximum number of results (default: 20)')
+    parser.add_argument('--newest', action='store_true', help='order by date instead of relevance')
+    parser.add_argument('--json', action='store_true', help='print the matching articles as JSON')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    since = args.since
+    if args.days is not None:
+        since = datetime.now() - timedelta(days=args.days)
+
+    with ArticleStore(args.db) as store:
+        start = time.perf_counter()
+        try:
+            articles = store.search(args.query, since=since, until=args.until, source=args.source,
+                                    limit=args.limit, order='date' if args.newest else 'rank')
+        except ValueError as e:
+            sys.exit(f"Invalid query: {e}")
+        elapsed = time.perf_counter() - start
+
+    if args.json:
+        json.dump(articles, sys.stdout, indent=2, default=str)
+        print()
+    else:
+        for article in articles:
+            print(format_result(article))
+        print(f"{len(articles)} result{plural(len(articles))} in {elapsed * 1000:.1f} ms",
+              file=sys.stderr)
+
+
+# Usage example
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    main()
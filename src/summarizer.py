@@ -1,94 +1,114 @@
+import io
 import json
 from datetime import datetime
-from docx import Document
-from docx.shared import Inches
 import logging
 
+from classifier import ArticleClassifier
+from digest import ArticleDigest
+from templates import Template
+
+# Part of every RenderCache key; bump it whenever the text summary or Word
+# document changes for the same articles
+RENDER_VERSION = 1
+
+TEXT_SUMMARY_HEADER = Template("""# AI News Weekly Summary
+Generated on: {date}
+Total Articles Analyzed: {total}
+
+## Executive Summary
+This week in AI saw {research} research developments, {industry} industry updates, {policy} policy discussions, and {education} educational resources.
+
+""")
+
+TEXT_SUMMARY_ARTICLE = Template("""{index}. **{title}{indicator}**
+   Source: {source}
+   Link: {link}
+""")
+
+TEXT_SUMMARY_SECTIONS = [
+    ('critical', '## 🚨 Critical Developments\n\n'),
+    ('research', '## 🔬 Research & Development\n\n'),
+    ('industry', '## 🏢 Industry News & Products\n\n'),
+    ('policy', '## 📋 Policy & Ethics\n\n'),
+    ('education', '## 📚 Learning Resources\n\n')
+]
+
+PRIORITY_INDICATORS = {'Critical': ' 🔥', 'High': ' ⭐'}
+
 class AINewsSummarizer:
-    def __init__(self):
+    def __init__(self, fragments=None):
         self.logger = logging.getLogger(__name__)
+        self.classifier = ArticleClassifier()
+        # Optional FragmentCache reusing article blocks of earlier renders
+        self.fragments = fragments
     
-    def categorize_articles(self, articles):
-        """Enhanced categorization with priority levels"""
-        categories = {
-            'critical': [],     # Must-read articles
-            'research': [],     # Academic papers and studies
-            'industry': [],     # Company news and products
-            'policy': [],       # Regulation and governance
-            'education': []     # Tutorials and guides
-        }
-        
-        for article in articles:
-            text = (article['title'] + ' ' + article['summary']).lower()
-            source = article.get('source', '').lower()
-            priority_level = article.get('priority_level', 'Low')
-            
-            # Critical articles (high relevance score)
-            if priority_level == "Critical":
-                categories['critical'].append(article)
-            
-            # Categorize by content
-            elif any(kw in text for kw in ['arxiv', 'research', 'paper', 'study', 'academic']):
-                categories['research'].append(article)
-            elif any(kw in text for kw in ['regulation', 'policy', 'law', 'ethics', 'governance', 'government']):
-                categories['policy'].append(article)
-            elif any(kw in text for kw in ['tutorial', 'guide', 'how-to', 'course', 'learning']):
-                categories['education'].append(article)
-            else:
-                # Default to industry news
-                categories['industry'].append(article)
-        
-        return categories
+    def _as_digest(self, articles):
+        """Accept either an article list or an ArticleDigest"""
+        if isinstance(articles, ArticleDigest):
+            return articles
+        return ArticleDigest.from_articles(articles, self.classifier)
     
     def create_text_summary(self, articles):
-        """Create a text-based summary"""
-        categories = self.categorize_articles(articles)
+        """Create a text-based summary from an article list or ArticleDigest"""
+        buffer = io.StringIO()
+        self.write_text_summary(articles, buffer)
+        return buffer.getvalue()
+    
+    def write_text_summary(self, articles, out):
+        """Stream the text summary to out, an open file or other writer"""
+        digest = self._as_digest(articles)
+        categories = digest.summary_categories
         
-        summary = f"""# AI News Weekly Summary
-Generated on: {datetime.now().strftime('%B %d, %Y')}
-Total Articles Analyzed: {len(articles)}
-
-## Executive Summary
-This week in AI saw {len(categories['research'])} research developments, {len(categories['industry'])} industry updates, {len(categories['policy'])} policy discussions, and {len(categories['education'])} educational resources.
-
-"""
+        TEXT_SUMMARY_HEADER.write(
+            out,
+            date=datetime.now().strftime('%B %d, %Y'),
+            total=digest.total,
+            research=categories['research'].total,
+            industry=categories['industry'].total,
+            policy=categories['policy'].total,
+            education=categories['education'].total
+        )
         
         # Add each category
-        category_titles = {
-            'critical': '🚨 Critical Developments',
-            'research': '🔬 Research & Development',
-            'industry': '🏢 Industry News & Products', 
-            'policy': '📋 Policy & Ethics',
-            'education': '📚 Learning Resources'
-        }
-        
-        for cat_key, title in category_titles.items():
-            if categories[cat_key]:
-                summary += f"## {title}\n\n"
-                # Show more items for critical news
-                max_items = 10 if cat_key == 'critical' else 5
-                for i, article in enumerate(categories[cat_key][:max_items], 1):
-                    priority_indicator = ""
-                    if article.get('priority_level') == 'Critical':
-                        priority_indicator = " 🔥"
-                    elif article.get('priority_level') == 'High':
-                        priority_indicator = " ⭐"
-                    
-                    summary += f"{i}. **{article['title']}{priority_indicator}**\n"
-                    summary += f"   Source: {article['source']}\n"
-                    summary += f"   Link: {article['link']}\n"
-                    if article['summary']:
-                        # Truncate summary to first sentence
-                        first_sentence = article['summary'].split('.')[0] + '.'
-                        summary += f"   Summary: {first_sentence}\n"
-                    if article.get('relevance_score'):
-                        summary += f"   Relevance Score: {article['relevance_score']}\n"
-                    summary += "\n"
-        
-        return summary
+        for cat_key, heading in TEXT_SUMMARY_SECTIONS:
+            if not categories[cat_key].total:
+                continue
+            out.write(heading)
+            # Show more items for critical news
+            max_items = 10 if cat_key == 'critical' else 5
+            for i, article in enumerate(categories[cat_key].items()[:max_items], 1):
+                if self.fragments is None:
+                    self._write_text_article(out, article, i)
+                    continue
+                out.write(self.fragments.render(
+                    lambda buffer: self._write_text_article(buffer, article, i),
+                    RENDER_VERSION, i, article['title'], article.get('priority_level'),
+                    article['source'], article['link'], article['summary'],
+                    article.get('relevance_score')
+                ))
+    
+    def _write_text_article(self, out, article, index):
+        """One numbered article block of the text summary"""
+        TEXT_SUMMARY_ARTICLE.write(
+            out,
+            index=index,
+            title=article['title'],
+            indicator=PRIORITY_INDICATORS.get(article.get('priority_level'), ''),
+            source=article['source'],
+            link=article['link']
+        )
+        if article['summary']:
+            # Truncate summary to first sentence
+            out.write(f"   Summary: {article['summary'].split('.', 1)[0]}.\n")
+        if article.get('relevance_score'):
+            out.write(f"   Relevance Score: {article['relevance_score']}\n")
+        out.write("\n")
     
     def create_word_document(self, articles, output_path=None, custom_name=None):
-        """Create a Word document summary"""
+        """Create a Word document summary from an article list or ArticleDigest"""
+        # python-docx is slow to import, so only the Word renderer loads it
+        from docx import Document
+        
         if output_path is None:
             if custom_name:
                 output_path = f"outputs/{custom_name}_{datetime.now().strftime('%Y%m%d')}.docx"
@@ -100,13 +120,13 @@ This week in AI saw {len(categories['research'])} research developments, {len(ca
         # Title
         title = doc.add_heading('AI News Weekly Summary', 0)
         doc.add_paragraph(f"Generated on: {datetime.now().strftime('%B %d, %Y')}")
-        doc.add_paragraph(f"Total Articles Analyzed: {len(articles)}")
-        
-        categories = self.categorize_articles(articles)
+        digest = self._as_digest(articles)
+        categories = digest.summary_categories
+        doc.add_paragraph(f"Total Articles Analyzed: {digest.total}")
         
         # Executive Summary
         doc.add_heading('Executive Summary', level=1)
-        exec_summary = f"This week in AI saw {len(categories['research'])} research developments, {len(categories['industry'])} industry updates, {len(categories['policy'])} policy discussions, and {len(categories['education'])} educational resources."
+        exec_summary = f"This week in AI saw {categories['research'].total} research developments, {categories['industry'].total} industry updates, {categories['policy'].total} policy discussions, and {categories['education'].total} educational resources."
         doc.add_paragraph(exec_summary)
         
         # Add each category
@@ -119,10 +139,10 @@ This week in AI saw {len(categories['research'])} research developments, {len(ca
         ]
         
         for cat_key, title in category_info:
-            if categories[cat_key]:
+            if categories[cat_key].total:
                 doc.add_heading(title, level=1)
                 
-                for i, article in enumerate(categories[cat_key][:5], 1):
+                for i, article in enumerate(categories[cat_key].items()[:5], 1):
                     # Article title
                     p = doc.add_paragraph()
                     p.add_run(f"{i}. {article['title']}").bold = True
@@ -151,9 +171,8 @@ if __name__ == "__main__":
     summarizer = AINewsSummarizer()
     
     # Create text summary
-    text_summary = summarizer.create_text_summary(articles)
     with open('outputs/summary.txt', 'w') as f:
-        f.write(text_summary)
+        summarizer.write_text_summary(articles, f)
     
     # Create Word document
     summarizer.create_word_document(articles)
\ No newline at end of file
@@ -0,0 +1,37 @@
+import io
+from string import Formatter
+
+
+def plural(count, suffix='s'):
+    """Suffix for count items: plural(1) == '', plural(3) == 's'"""
+    return '' if count == 1 else suffix
+
+
+class Template:
+    """A str.format-style template parsed once into literal chunks and fields
+
+    Renderers keep their static text in module-level Templates instead of
+    rebuilding it with f-strings and += on every call. write() streams the
+    chunks to anything with a write() method (an open file or io.StringIO),
+    so a document of any size is produced in one linear pass.
+    Fields are plain names with an optional format spec, e.g. {total:,}.
+    """
+    def __init__(self, text):
+        self.parts = []
+        for literal, field, spec, conversion in Formatter().parse(text):
+            if field is not None and (not field.isidentifier() or conversion):
+                raise ValueError(f"Unsupported template field: {field!r}")
+            self.parts.append((literal, field, spec))
+
+    def write(self, out, **values):
+        for literal, field, spec in self.parts:
+            if literal:
+                out.write(literal)
+            if field is not None:
+                value = values[field]
+                out.write(format(value, spec) if spec else str(value))
+
+    def render(self, **values):
+        buffer = io.StringIO()
+        self.write(buffer, **values)
+        return buffer.getvalue()
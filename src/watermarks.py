@@ -0,0 +1,85 @@
+import json
+import os
+import threading
+import logging
+
+def entry_id(entry):
+    """Stable identity of a feed entry: its GUID, falling back to its link"""
+    return entry.get('id') or entry['link']
+
+
+class FeedWatermarks:
+    """Per-feed high-water marks for incremental collection
+
+    For every feed URL we remember the latest published timestamp seen and
+    the IDs of recently seen entries. An entry is new when its ID has not
+    been seen and it is not older than the watermark; undated entries are
+    judged by ID alone.
+    """
+    def __init__(self, path="data/feed_watermarks.json", max_seen_ids=1000):
+        self.path = path
+        self.max_seen_ids = max_seen_ids
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._marks = {}
+        self.load()
+
+    def load(self):
+        """Load watermarks from disk, starting empty if missing or corrupt"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                self._marks = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable watermarks {self.path}: {e}")
+            self._marks = {}
+
+    def new_entries(self, url, entries):
+        """Return the entries of url not covered by its watermark, then advance it"""
+        with self._lock:
+            mark = self._marks.get(url)
+            if mark is None:
+                fresh = list(entries)
+            else:
+                seen = set(mark['seen_ids'])
+                latest = mark['latest']
+                fresh = [entry for entry in entries
+                         if entry_id(entry) not in seen
+                         and not (entry['published'] and latest and entry['published'] < latest)]
+            self._advance(url, entries)
+        return fresh
+
+    def _advance(self, url, entries):
+        mark = self._marks.get(url, {'latest': None, 'seen_ids': []})
+
+        dates = [entry['published'] for entry in entries if entry['published']]
+        if mark['latest']:
+            dates.append(mark['latest'])
+
+        # Newest IDs first so truncation drops the oldest ones
+        seen_ids = [entry_id(entry) for entry in entries] + mark['seen_ids']
+        self._marks[url] = {
+            'latest': max(dates) if dates else None,
+            'seen_ids': list(dict.fromkeys(seen_ids))[:self.max_seen_ids]
+        }
+
+    def prune(self, urls):
+        """Drop watermarks of feeds no longer configured"""
+        keep = set(urls)
+        with self._lock:
+            for url in list(self._marks):
+                if url not in keep:
+                    del self._marks[url]
+
+    def save(self):
+        """Write watermarks to disk atomically"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{self.path}.tmp"
+        with self._lock:
+            with open(tmp_path, 'w') as f:
+                json.dump(self._marks, f)
+        os.replace(tmp_path, self.path)
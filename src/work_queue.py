@@ -0,0 +1,319 @@
+import json
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from datetime import datetime
+from urllib.parse import urlparse
+import logging
+
+
+def default_worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def shard_feeds(feeds, shard_size=25):
+    """Split feeds into shards of about shard_size, keeping each host in one shard
+
+    Returns lists of (position, feed_config) with position the feed's index in
+    feeds. Feeds on one host stay together so the worker fetching them
+    still spaces out requests to that host with its HostThrottle.
+    """
+    hosts = {}
+    for position, feed in enumerate(feeds):
+        hosts.setdefault(urlparse(feed['url']).netloc.lower(), []).append((position, feed))
+
+    shards = []
+    current = []
+    for group in hosts.values():
+        if current and len(current) + len(group) > shard_size:
+            shards.append(current)
+            current = []
+        current += group
+    if current:
+        shards.append(current)
+    return shards
+
+
+class WorkQueue:
+    """SQLite-backed queue of feed shards for sharded collection
+
+    A run splits the configured feeds into shards (see shard_feeds). Worker
+    processes on this machine claim one shard at a time, fetch it and store
+    its articles, feed metrics and feed cache updates back in the queue. A
+    claim is a lease: a shard whose worker dies is handed out again once
+    lease_seconds pass, at most max_attempts times. merge() then
+    reassembles the results in config order, so the merged article list
+    does not depend on which worker fetched what or when.
+
+    All processes must run on the machine holding the database file: WAL
+    mode does not work over network filesystems, and run deadlines and
+    leases are time.time() values compared across processes.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS runs (
+            run_id TEXT PRIMARY KEY,
+            created TEXT NOT NULL,
+            cutoff TEXT NOT NULL,
+            deadline REAL
+        );
+        CREATE TABLE IF NOT EXISTS work_items (
+            id INTEGER PRIMARY KEY,
+            run_id TEXT NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+            shard INTEGER NOT NULL,
+            feeds TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            worker TEXT,
+            claimed_at REAL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            result TEXT,
+            error TEXT,
+            UNIQUE (run_id, shard)
+        );
+        CREATE INDEX IF NOT EXISTS idx_work_items_status ON work_items(status, id);
+    """
+
+    def __init__(self, path="data/work_queue.db", lease_seconds=600, max_attempts=3):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.logger = logging.getLogger(__name__)
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Autocommit mode; claims take the write lock explicitly. WAL needs
+        # shared memory, so the file must be on a local disk
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(self.SCHEMA)
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(runs)")]
+        if 'deadline' not in columns:
+            self.conn.execute("ALTER TABLE runs ADD COLUMN deadline REAL")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def create_run(self, feeds, cutoff_date, shard_size=25, deadline=None):
+        """Queue one work item per shard of feeds and return the new run id
+
+        deadline (a time.time() value) applies to every worker of the run.
+        """
+        run_id = f"{datetime.now().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        shards = shard_feeds(feeds, shard_size)
+        with self.conn:
+            self.conn.execute("BEGIN")
+            self.conn.execute(
+                "INSERT INTO runs (run_id, created, cutoff, deadline) VALUES (?, ?, ?, ?)",
+                (run_id, datetime.now().isoformat(), cutoff_date.isoformat(), deadline)
+            )
+            self.conn.executemany(
+                "INSERT INTO work_items (run_id, shard, feeds) VALUES (?, ?, ?)",
+                [(run_id, index, json.dumps(shard)) for index, shard in enumerate(shards)]
+            )
+        self.logger.info(f"Queued {len(feeds)} feeds as {len(shards)} shards for run {run_id}")
+        return run_id
+
+    def claim(self, worker_id, run_id=None):
+        """Lease the oldest available shard to worker_id
+
+        Returns (item_id, run_id, cutoff_date, deadline, [(position, feed_config)])
+        or None when nothing is available right now.
+        """
+        now = time.time()
+        expired = now - self.lease_seconds
+        item_filter = "AND run_id = ?" if run_id else ""
+        join_filter = "AND w.run_id = ?" if run_id else ""
+        params = (run_id,) if run_id else ()
+
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Shards whose last lease expired after the final attempt give up
+            self.conn.execute(f"""
+                UPDATE work_items SET status = 'failed', error = 'lease expired'
+                WHERE status = 'claimed' AND claimed_at < ? AND attempts >= ? {item_filter}
+            """, (expired, self.max_attempts) + params)
+            row = self.conn.execute(f"""
+                SELECT w.id, w.run_id, r.cutoff, r.deadline, w.feeds
+                FROM work_items w JOIN runs r ON r.run_id = w.run_id
+                WHERE (w.status = 'pending' OR (w.status = 'claimed' AND w.claimed_at < ?)) {join_filter}
+                ORDER BY w.id LIMIT 1
+            """, (expired,) + params).fetchone()
+            if row:
+                self.conn.execute("""
+                    UPDATE work_items
+                    SET status = 'claimed', worker = ?, claimed_at = ?, attempts = attempts + 1
+                    WHERE id = ?
+                """, (worker_id, now, row[0]))
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+
+        if row is None:
+            return None
+        item_id, claimed_run, cutoff, deadline, feeds = row
+        return (item_id, claimed_run, datetime.fromisoformat(cutoff), deadline,
+                [tuple(entry) for entry in json.loads(feeds)])
+
+    def complete(self, item_id, worker_id, result):
+        """Store a shard's result; False if the lease was lost to another worker"""
+        cursor = self.conn.execute("""
+            UPDATE work_items SET status = 'done', result = ?, error = NULL
+            WHERE id = ? AND worker = ? AND status = 'claimed'
+        """, (json.dumps(result, default=str), item_id, worker_id))
+        if not cursor.rowcount:
+            self.logger.warning(f"Work item {item_id} was reassigned, discarding result of {worker_id}")
+        return bool(cursor.rowcount)
+
+    def fail(self, item_id, worker_id, error):
+        """Give a shard back for another attempt, or fail it after max_attempts"""
+        self.conn.execute("""
+            UPDATE work_items
+            SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                error = ?, worker = NULL, claimed_at = NULL
+            WHERE id = ? AND worker = ? AND status = 'claimed'
+        """, (self.max_attempts, str(error), item_id, worker_id))
+
+    def counts(self, run_id):
+        """{status: number of work items} for a run"""
+        return dict(self.conn.execute(
+            "SELECT status, COUNT(*) FROM work_items WHERE run_id = ? GROUP BY status", (run_id,)
+        ).fetchall())
+
+    def is_finished(self, run_id):
+        counts = self.counts(run_id)
+        return not counts.get('pending') and not counts.get('claimed')
+
+    def merge(self, run_id):
+        """Reassemble a finished run's results in config order
+
+        Returns (articles, feed_records, updates, failed_feeds): article
+        dicts of every feed in config order, one metrics record per fetched
+        feed in config order, {'cache': ..., 'health': ...} state changes by
+        URL for FeedCache and FeedHealth plus the texts cleaned by the
+        HTMLTextCleaner under 'html_text', and the feed configs of shards
+        that failed for good.
+        """
+        if not self.is_finished(run_id):
+            raise RuntimeError(f"Run {run_id} still has unfinished work items")
+
+        by_position = {}
+        records = {}
+        updates = {'cache': {}, 'health': {}, 'html_text': {}}
+        failed_feeds = []
+        rows = self.conn.execute(
+            "SELECT status, feeds, result, error FROM work_items WHERE run_id = ? ORDER BY shard", (run_id,)
+        )
+        for status, feeds, result, error in rows:
+            if status != 'done':
+                self.logger.error(f"Shard of {len(json.loads(feeds))} feeds failed: {error}")
+                failed_feeds += [feed for _, feed in json.loads(feeds)]
+                continue
+            result = json.loads(result)
+            for position, articles in result['articles']:
+                by_position[position] = articles
+            for position, record in result['feeds']:
+                records[position] = record
+            updates['cache'].update(result['cache'])
+            updates['health'].update(result['health'])
+            updates['html_text'].update(result['html_text'])
+
+        articles = []
+        for position in sorted(by_position):
+            articles += by_position[position]
+        return articles, [records[position] for position in sorted(records)], updates, failed_feeds
+
+    def delete_run(self, run_id):
+        with self.conn:
+            self.conn.execute("BEGIN")
+            self.conn.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
+
+
+def work(queue, collector, worker_id=None, run_id=None, until_finished=False, poll_interval=1.0):
+    """Claim and fetch shards with collector until there is nothing left to do
+
+    With until_finished (and a run_id) keep waiting for shards leased to
+    other workers instead of returning, so that when this returns the run
+    is complete. Returns the number of shards fetched.
+    """
+    from metrics import RunMetrics
+
+    worker_id = worker_id or default_worker_id()
+    logger = logging.getLogger(__name__)
+    done = 0
+    while True:
+        claimed = queue.claim(worker_id, run_id)
+        if claimed is None:
+            if until_finished and run_id and not queue.is_finished(run_id):
+                time.sleep(poll_interval)
+                continue
+            return done
+
+        item_id, _, cutoff_date, deadline, shard = claimed
+        metrics = collector.metrics
+        collector.metrics = shard_metrics = RunMetrics()
+        try:
+            results = collector.fetch_feeds([feed for _, feed in shard], cutoff_date, deadline)
+        except Exception as e:
+            logger.error(f"Shard {item_id} failed: {e}")
+            queue.fail(item_id, worker_id, e)
+            continue
+        finally:
+            collector.metrics = metrics
+
+        positions = {feed['url']: position for position, feed in shard}
+        cache = collector.feed_cache
+        health = collector.feed_health
+        html_text = collector.html_text
+        queue.complete(item_id, worker_id, {
+            'articles': [[position, [article.to_dict() for article in articles]]
+                         for (position, _), (_, articles) in zip(shard, results)],
+            'feeds': [[positions[record['url']], record] for record in shard_metrics.feeds],
+            'cache': cache.changes(positions) if cache else {},
+            'health': health.changes(positions) if health else {},
+            'html_text': html_text.take_changes() if html_text else {}
+        })
+        done += 1
+
+
+def run_worker(queue_path, config_path, worker_id=None, run_id=None, until_finished=False,
+               lease_seconds=600, max_attempts=3):
+    """Worker process entry point: its own collector and queue connection"""
+    from collector import AINewsCollector
+
+    collector = AINewsCollector(config_path)
+    with WorkQueue(queue_path, lease_seconds, max_attempts) as queue:
+        return work(queue, collector, worker_id, run_id, until_finished)
+
+
+# Usage example
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Work on, or inspect, the sharded collection queue")
+    parser.add_argument('command', choices=['worker', 'status'])
+    parser.add_argument('--queue', default='data/work_queue.db')
+    parser.add_argument('--config', default='config/sources.json')
+    parser.add_argument('--run', help='only work on this run')
+    parser.add_argument('--wait', action='store_true',
+                        help='with --run, stay until the run is complete')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.command == 'worker':
+        fetched = run_worker(args.queue, args.config, run_id=args.run, until_finished=args.wait)
+        print(f"Fetched {fetched} shards")
+    else:
+        with WorkQueue(args.queue) as queue:
+            for (run_id,) in queue.conn.execute("SELECT run_id FROM runs ORDER BY created"):
+                print(run_id, queue.counts(run_id))